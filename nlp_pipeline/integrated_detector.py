@@ -6,7 +6,12 @@ Weights: 0.6 RAG + 0.4 Rules. Risk: SAFE/LOW/POTENTIAL/HIGH.
 
 import re
 import random
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
+
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; substring loops are used without it
+    ahocorasick = None
 
 try:
     from .rag_detector import get_detector
@@ -22,12 +27,14 @@ try:
         is_trusted, analyze_url_kb
     )
     from security_logic.multilingual_map import normalize_text, normalize_obfuscation
+    from security_logic.base import GapPattern, compile_each
     from security_logic.email_analyzer import analyze_sender, analyze_email_headers
 except ImportError:
     from ..security_logic.url_knowledge_base import (
         is_trusted, analyze_url_kb
     )
     from ..security_logic.multilingual_map import normalize_text, normalize_obfuscation
+    from ..security_logic.base import GapPattern, compile_each
     from ..security_logic.email_analyzer import analyze_sender, analyze_email_headers
 
 
@@ -420,25 +427,57 @@ ADVICE_MAP = {
 }
 
 
+def _keyword_automaton(*keyword_lists):
+    """
+    Build one Aho-Corasick automaton over several keyword lists, or None
+    without pyahocorasick. Each keyword maps to itself.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for kw in {kw for kws in keyword_lists for kw in kws}:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
+def _keyword_test(automaton, msg: str) -> Callable[[str], bool]:
+    """
+    Return a test equivalent to `kw in msg` for the automaton's keywords.
+
+    With an automaton, one pass over msg collects every keyword occurring
+    in it (overlaps included) and the test is a set lookup; without one it
+    falls back to substring search per keyword. str search already runs
+    over one byte per character for ASCII text, so encoding msg to bytes
+    for bytes.find would only add a copy.
+    """
+    if automaton is None:
+        return msg.__contains__
+    return {kw for _, kw in automaton.iter(msg)}.__contains__
+
+
+_RULE_URGENCY_KW = (
+    "urgent", "immediately", "action required", "right now", "final warning",
+    "last chance", "expires", "within", "minutes", "hours",
+)
+_RULE_AUTHORITY_KW = (
+    "bank", "irs", "income tax", "admin", "ceo", "cfo", "director",
+    "manager", "support", "it department", "police", "court",
+)
+_RULE_SENSITIVE_KW = (
+    "otp", "password", "pin", "cvv", "verify account", "verify your identity",
+    "credentials", "login", "card details", "bank details", "ssn",
+)
+_RULE_KW_AC = _keyword_automaton(_RULE_URGENCY_KW, _RULE_AUTHORITY_KW, _RULE_SENSITIVE_KW)
+
+
 def extract_rule_signals(text: str) -> Dict:
     msg = text.lower()
+    has = _keyword_test(_RULE_KW_AC, msg)
 
-    urgency_keywords = [
-        "urgent", "immediately", "action required", "right now", "final warning",
-        "last chance", "expires", "within", "minutes", "hours",
-    ]
-    authority_keywords = [
-        "bank", "irs", "income tax", "admin", "ceo", "cfo", "director",
-        "manager", "support", "it department", "police", "court",
-    ]
-    sensitive_keywords = [
-        "otp", "password", "pin", "cvv", "verify account", "verify your identity",
-        "credentials", "login", "card details", "bank details", "ssn",
-    ]
-
-    found_urgency = [kw for kw in urgency_keywords if kw in msg]
-    found_authority = [kw for kw in authority_keywords if kw in msg]
-    found_sensitive = [kw for kw in sensitive_keywords if kw in msg]
+    found_urgency = [kw for kw in _RULE_URGENCY_KW if has(kw)]
+    found_authority = [kw for kw in _RULE_AUTHORITY_KW if has(kw)]
+    found_sensitive = [kw for kw in _RULE_SENSITIVE_KW if has(kw)]
 
     return {
         "urgency": found_urgency,
@@ -456,23 +495,26 @@ def extract_rule_signals(text: str) -> Dict:
     }
 
 
+_PATTERN_FINANCIAL_TERMS = (
+    "bank", "wire", "transfer", "refund", "payment", "invoice", "card",
+    "wallet", "bitcoin", "cashback", "prize", "bonus", "tax",
+)
+_PATTERN_LOGIN_TERMS = (
+    "login", "password", "verify", "confirm", "otp", "credential", "account",
+    "security", "reset", "mfa",
+)
+_PATTERN_TERMS_AC = _keyword_automaton(_PATTERN_FINANCIAL_TERMS, _PATTERN_LOGIN_TERMS)
+
+
 def extract_pattern_features(text: str) -> Dict:
     msg = text.lower()
     urls = re.findall(r"https?://\S+|www\.\S+", text, flags=re.IGNORECASE)
     numbers = re.findall(r"\b\d{4,8}\b", text)
     otp_like = [n for n in numbers if len(n) in (4, 6)]
 
-    financial_terms_all = [
-        "bank", "wire", "transfer", "refund", "payment", "invoice", "card",
-        "wallet", "bitcoin", "cashback", "prize", "bonus", "tax",
-    ]
-    login_terms_all = [
-        "login", "password", "verify", "confirm", "otp", "credential", "account",
-        "security", "reset", "mfa",
-    ]
-
-    financial_terms = [kw for kw in financial_terms_all if kw in msg]
-    login_terms = [kw for kw in login_terms_all if kw in msg]
+    has = _keyword_test(_PATTERN_TERMS_AC, msg)
+    financial_terms = [kw for kw in _PATTERN_FINANCIAL_TERMS if has(kw)]
+    login_terms = [kw for kw in _PATTERN_LOGIN_TERMS if has(kw)]
 
     return {
         "urls": urls,
@@ -482,7 +524,12 @@ def extract_pattern_features(text: str) -> Dict:
     }
 
 
-def get_similar_patterns(top_k_results: List[Dict], max_patterns: int = 5, min_similarity: float = 0.50) -> List[Dict]:
+def get_similar_patterns(
+    top_k_results: List[Dict],
+    max_patterns: int = 5,
+    min_similarity: float = 0.50,
+    token_lookup: Optional[Callable[[str], Optional[frozenset]]] = None,
+) -> List[Dict]:
     """
     Get similar attack patterns from knowledge base.
     
@@ -490,6 +537,8 @@ def get_similar_patterns(top_k_results: List[Dict], max_patterns: int = 5, min_s
         top_k_results: Top K results from RAG retrieval
         max_patterns: Maximum number of patterns to return (default 5)
         min_similarity: Minimum similarity threshold (0-1 scale, default 0.50 = 50%)
+        token_lookup: Precomputed token set for a result text, or None if
+            unknown (e.g. RAGSocialEngineeringDetector.pattern_tokens)
     
     Returns:
         List of similar patterns with text, category, and similarity score
@@ -504,6 +553,7 @@ def get_similar_patterns(top_k_results: List[Dict], max_patterns: int = 5, min_s
     )
 
     selected: List[Dict] = []
+    selected_tokens: List[frozenset] = []
     for row in filtered:
         text = row.get("text", "").strip()
         similarity = float(row.get("similarity", 0.0))
@@ -515,12 +565,13 @@ def get_similar_patterns(top_k_results: List[Dict], max_patterns: int = 5, min_s
         if not text:
             continue
 
-        norm = text.lower()
-        cand_tokens = set(re.findall(r"[a-z0-9]+", norm))
+        # Token sets are precomputed at KB ingest; fall back for other sources
+        cand_tokens = token_lookup(row["text"]) if token_lookup is not None else None
+        if cand_tokens is None:
+            cand_tokens = frozenset(re.findall(r"[a-z0-9]+", text.lower()))
         duplicate = False
 
-        for chosen in selected:
-            chosen_tokens = set(re.findall(r"[a-z0-9]+", chosen["text"].lower()))
+        for chosen_tokens in selected_tokens:
             if not cand_tokens or not chosen_tokens:
                 continue
             jacc = len(cand_tokens & chosen_tokens) / max(1, len(cand_tokens | chosen_tokens))
@@ -538,6 +589,7 @@ def get_similar_patterns(top_k_results: List[Dict], max_patterns: int = 5, min_s
                 "similarity": round(similarity * 100, 2),
             }
         )
+        selected_tokens.append(cand_tokens)
 
         if len(selected) >= max_patterns:
             break
@@ -720,9 +772,13 @@ class IntegratedSocialEngineeringDetector:
         "crypto platform", "trading platform", "investment platform",
     ]
 
+    # Every substring keyword list above in one automaton (None without
+    # pyahocorasick), so _signals() scans each text once
+    _KW_AC = _keyword_automaton(FEAR_KW, DEADLINE_KW, BRAND_KW, AUTHORITY_KW, REWARD_KW)
+
     # Scam indicator patterns (regex) for stronger detection
-    _SCAM_RX = [
-        re.compile(p, re.IGNORECASE) for p in [
+    _SCAM_RX = compile_each(
+        [
             r"\b(?:earn|make)\s+\$\d+",
             r"\bguaranteed\s+\d+%?\s+returns?\b",
             r"\bwork(?:ing)?\s+from\s+home\b",
@@ -732,17 +788,18 @@ class IntegratedSocialEngineeringDetector:
             r"\bgovernment\s+(?:stimulus|grant|payment)\b",
             r"\bpre[\s-]?approved\s+for\s+\$",
             r"\brandomly\s+selected\b",
-            r"\btransfer(?:ring)?\s+.*\bmillion\b",
+            GapPattern(r"\btransfer(?:ring)?\s+", r"\bmillion\b"),
             r"\breceive\s+\d+%\b",
-            r"\bprince\b.*\b(?:help|transfer|million)\b",
-        ]
-    ]
+            GapPattern(r"\bprince\b", r"\b(?:help|transfer|million)\b"),
+        ],
+        re.IGNORECASE,
+    )
 
     # OTP/Code theft scam patterns
-    _OTP_SCAM_RX = [
-        re.compile(p, re.IGNORECASE) for p in [
+    _OTP_SCAM_RX = compile_each(
+        [
             r"\b(?:send|forward|share|give)\s+(?:me\s+)?(?:the\s+)?(?:otp|code|pin)\b",
-            r"\b(?:verification|security)\s+code\b.*\b(?:send|reply|forward)\b",
+            GapPattern(r"\b(?:verification|security)\s+code\b", r"\b(?:send|reply|forward)\b"),
             r"\breply\s+with\s+(?:the\s+)?code\b",
             r"\bforward\s+(?:me\s+)?(?:the\s+)?\d[\s-]?digit\s+code\b",
             r"\b(?:accidentally|mistakenly)\s+sent\s+(?:my\s+)?code\b",
@@ -750,8 +807,9 @@ class IntegratedSocialEngineeringDetector:
             r"\bneed(?:ed)?\s+(?:for\s+)?(?:security\s+)?audit\b",
             r"\bsend\s+it\s+now\b",
             r"\bverification\s+code\s+is\s+needed\b",
-        ]
-    ]
+        ],
+        re.IGNORECASE,
+    )
 
     # Romance/advance fee scam patterns
     _ROMANCE_SCAM_RX = [
@@ -887,18 +945,19 @@ class IntegratedSocialEngineeringDetector:
         return merged
 
     def _signals(self, msg: str) -> Dict:
+        has = _keyword_test(self._KW_AC, msg)
         return {
-            "fear": [kw for kw in self.FEAR_KW if kw in msg],
-            "deadline": [kw for kw in self.DEADLINE_KW if kw in msg],
+            "fear": [kw for kw in self.FEAR_KW if has(kw)],
+            "deadline": [kw for kw in self.DEADLINE_KW if has(kw)],
             "gov": [kw for kw in self.GOV_KW if self._contains_whole_term(msg, kw)],
             "identity": any(rx.search(msg) for rx in self._IDENTITY_RX),
-            "brand": [kw for kw in self.BRAND_KW if kw in msg],
+            "brand": [kw for kw in self.BRAND_KW if has(kw)],
             "authority": [
                 kw for kw in self.AUTHORITY_KW
-                if kw in msg and not self._auth_benign.search(msg)
+                if has(kw) and not self._auth_benign.search(msg)
             ],
             "sensitive": any(rx.search(msg) for rx in self._SENSITIVE_RX),
-            "reward": [kw for kw in self.REWARD_KW if kw in msg],
+            "reward": [kw for kw in self.REWARD_KW if has(kw)],
             "scam": any(rx.search(msg) for rx in self._SCAM_RX),
             "otp_scam": any(rx.search(msg) for rx in self._OTP_SCAM_RX),
             "romance_scam": any(rx.search(msg) for rx in self._ROMANCE_SCAM_RX),
@@ -951,7 +1010,9 @@ class IntegratedSocialEngineeringDetector:
         rule_signals = extract_rule_signals(message)
 
         if self._whitelisted(msg, sig):
-            similar_patterns = get_similar_patterns(top_k_results, max_patterns=5)
+            similar_patterns = get_similar_patterns(
+                top_k_results, max_patterns=5, token_lookup=self.rag.pattern_tokens
+            )
             advice = get_advice("normal_communication")
             return {
                 "attack_detected": False,
@@ -982,7 +1043,9 @@ class IntegratedSocialEngineeringDetector:
             sig["reward"],
             sig["deadline"],
         ]):
-            similar_patterns = get_similar_patterns(top_k_results, max_patterns=5)
+            similar_patterns = get_similar_patterns(
+                top_k_results, max_patterns=5, token_lookup=self.rag.pattern_tokens
+            )
             advice = get_advice("normal_communication")
             return {
                 "attack_detected": False,
@@ -1003,7 +1066,7 @@ class IntegratedSocialEngineeringDetector:
                 "context": {}
             }
 
-        rag_conf, rag_cat = self.rag.detect(message)
+        rag_conf, rag_cat = self.rag.detect(message, msg)
         rule_conf, rule_cats = self._rule_engine(sig)
 
         # Check for strong attack indicators that should NOT be suppressed
@@ -1043,7 +1106,9 @@ class IntegratedSocialEngineeringDetector:
 
         dominant_display = result["categories"][0] if result["categories"] else rag_cat
         dominant_internal = DISPLAY_TO_INTERNAL_CATEGORY.get(dominant_display, rag_cat)
-        similar_patterns = get_similar_patterns(top_k_results, max_patterns=5)
+        similar_patterns = get_similar_patterns(
+            top_k_results, max_patterns=5, token_lookup=self.rag.pattern_tokens
+        )
         advice = get_advice(dominant_internal)
         why_flagged = generate_explanation(
             text=message,
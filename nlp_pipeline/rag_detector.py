@@ -4,10 +4,181 @@ Returns ONLY: rag_confidence (0-100) and voted_category.
 """
 
 import math
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity as _vector_match
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import faiss
+except ImportError:  # optional accelerator; NumPy search is used without it
+    faiss = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; phrase regexes are used without it
+    ahocorasick = None
+
+# Encoder threading is process-wide, so torch's defaults are kept unless
+# RAG_TORCH_THREADS is set: then that many intra-op threads and a single
+# inter-op thread, which avoids oversubscription.
+if os.environ.get("RAG_TORCH_THREADS"):
+    torch.set_num_threads(int(os.environ["RAG_TORCH_THREADS"]))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set before the first inter-op parallel work in the process.
+        pass
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Candidates fetched from the quantised index per requested neighbour
+_SQ_OVERFETCH = 4
+
+# detect() result and query embedding caches: template lures are often
+# replayed verbatim, and retrieve_top_k() + detect() embed the same message
+_DETECT_CACHE_SIZE = 1024
+_EMBED_CACHE_SIZE = 1024
+_DETECT_CACHE_MAX_LEN = 2048
+
+# Legacy KB category names folded into their canonical category at ingest
+_CATEGORY_ALIASES = {
+    "psychological_coercion": "fear_threat",
+    "fear_threat_severe": "fear_threat",
+}
+
+# Calibration curve 0.92 * sigmoid(9 * (s - 0.40)) tabulated over s in [0, 1].
+# Nearest-entry lookup is within ~0.1 percentage points of the exact curve.
+_SIGMOID_STEPS = 1023
+_SIGMOID_LUT = np.array(
+    [0.92 / (1.0 + math.exp(-9.0 * (i / _SIGMOID_STEPS - 0.40))) for i in range(_SIGMOID_STEPS + 1)],
+    dtype=np.float32,
+)
+
+
+def _keyword_pattern(keywords: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile a keyword list into one alternation anchored at a word start,
+    longest phrase first, so "pan card" does not fire inside "japan card"
+    while "pan cards" still counts.
+    """
+    if not keywords:
+        return re.compile(r"(?!)")
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(re.escape(kw) for kw in ordered) + ")")
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same test as the regex \\w class for str patterns."""
+    return ch.isalnum() or ch == "_"
+
+
+def _score_kernel(
+    top_scores: np.ndarray,
+    top_idx: np.ndarray,
+    is_attack: np.ndarray,
+    cat_ids: np.ndarray,
+    base_conf: np.ndarray,
+    n_cats: int,
+    n_threat: np.ndarray,
+    has_deadline: np.ndarray,
+    is_safe_ctx: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calibrated probability and voted category id for each row of neighbours.
+
+    top_scores/top_idx are (n, k), best first; the per-pattern arrays are
+    indexed by top_idx; the keyword flags are (n,). Returns (probabilities,
+    category ids), with -1 where no neighbour is an attack. Pure array code,
+    so a whole batch is scored without per-message Python arithmetic.
+    """
+    n, k = top_idx.shape
+    top = top_scores[:, 0].astype(np.float64) if k else np.zeros(n)
+
+    # Convert top embedding score to malicious probability
+    lut_idx = np.clip((top * _SIGMOID_STEPS + 0.5).astype(np.intp), 0, _SIGMOID_STEPS)
+    prob = np.where(top > 0, _SIGMOID_LUT[lut_idx].astype(np.float64), 0.0)
+    prob = np.where(top < 0.30, np.minimum(prob, 0.15), prob)
+    prob = np.where(is_safe_ctx, np.minimum(prob, 0.25), prob)
+
+    # Neighbor agreement
+    attack = is_attack[top_idx]
+    agreement = attack.sum(axis=1) / max(k, 1)
+    prob = np.where((agreement >= 0.7) & (prob > 0.20), np.minimum(prob * 1.18, 0.95), prob)
+
+    # Threat keyword floors
+    floor = np.select(
+        [(n_threat >= 2) & has_deadline, n_threat >= 2, (n_threat >= 1) & has_deadline, n_threat >= 1],
+        [0.75, 0.60, 0.55, 0.40],
+        default=0.0,
+    )
+    prob = np.maximum(prob, floor)
+
+    # Neighbor vote for category: similarity * base confidence summed per
+    # category over attack neighbours, accumulated in rank order. Ties go to
+    # the category that appears first in rank order.
+    cats = cat_ids[top_idx]
+    weights = np.where(attack, top_scores.astype(np.float64) * base_conf[top_idx], 0.0)
+    rows = np.repeat(np.arange(n), k).reshape(n, k)
+    totals = np.zeros((n, max(n_cats, 1)))
+    np.add.at(totals, (rows, cats), weights)
+    ranked = np.where(attack, totals[rows, cats], -np.inf)
+    first_best = ranked.argmax(axis=1) if k else np.zeros(n, dtype=np.intp)
+    voted = np.where(attack.any(axis=1), cats[np.arange(n), first_best] if k else -1, -1)
+    return prob, voted
+
+
+def _onnx_model_file() -> str:
+    """Pick the int8 ONNX export for this CPU: VNNI kernels when available."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            if "avx512_vnni" in f.read():
+                return "onnx/model_qint8_avx512_vnni.onnx"
+    except OSError:
+        pass
+    return "onnx/model_quint8_avx2.onnx"
+
+
+def _phrase_automaton(*phrase_lists: Tuple[str, ...]):
+    """
+    Build one Aho-Corasick automaton over several phrase lists.
+
+    Each phrase maps to (bitmask of the lists containing it, phrase length),
+    so a single pass over a message reports hits for every list.
+    """
+    masks: Dict[str, int] = {}
+    for bit, phrases in enumerate(phrase_lists):
+        for phrase in phrases:
+            masks[phrase] = masks.get(phrase, 0) | (1 << bit)
+    automaton = ahocorasick.Automaton()
+    for phrase, mask in masks.items():
+        automaton.add_word(phrase, (mask, len(phrase)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _split_keywords(keywords: List[str]) -> Tuple[frozenset, Tuple[int, ...], Tuple[str, ...]]:
+    """
+    Split a keyword list into single-token words, their distinct lengths
+    (for _word_hits) and multi-token phrases.
+    """
+    words = frozenset(kw for kw in keywords if _TOKEN_RE.fullmatch(kw))
+    phrases = tuple(kw for kw in keywords if kw not in words)
+    return words, tuple(sorted({len(w) for w in words})), phrases
+
+
+def _word_hits(tokens: frozenset, words: frozenset, lengths: Tuple[int, ...]) -> set:
+    """
+    Keywords from words that start some message token, so inflected forms
+    count ("arrested", "courts") but words buried mid-token do not
+    ("financial" in "studentfinancial").
+    """
+    return {token[:n] for token in tokens for n in lengths if token[:n] in words}
 
 
 class RAGSocialEngineeringDetector:
@@ -29,6 +200,7 @@ class RAGSocialEngineeringDetector:
 
     DEADLINE_KW = [
         "immediately", "within 24 hours", "within 48 hours",
+        "within 1 hour", "within 2 hours",
         "right now", "act now", "in 1 hour", "in 2 hours",
         "within the next", "before authorities", "final warning",
         "within 10 minutes", "in 10 minutes", "in 30 minutes",
@@ -42,56 +214,307 @@ class RAGSocialEngineeringDetector:
         "no action required", "no action is needed",
     ]
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        print(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+    # Built once at class load. Single-token keywords are matched by set
+    # lookup of message token prefixes; only multi-token phrases go through
+    # a compiled word-bounded alternation (longest first, so nested phrases
+    # hit once).
+    _THREAT_WORDS, _THREAT_LENS, _THREAT_PHRASES = _split_keywords(THREAT_KW)
+    _DEADLINE_WORDS, _DEADLINE_LENS, _DEADLINE_PHRASES = _split_keywords(DEADLINE_KW)
+    _SAFE_WORDS, _SAFE_LENS, _SAFE_PHRASES = _split_keywords(SAFE_CONTEXT)
+    _THREAT_RE = _keyword_pattern(_THREAT_PHRASES)
+    _DEADLINE_RE = _keyword_pattern(_DEADLINE_PHRASES)
+    _SAFE_RE = _keyword_pattern(_SAFE_PHRASES)
+    _PHRASE_AC = (
+        _phrase_automaton(_THREAT_PHRASES, _DEADLINE_PHRASES, _SAFE_PHRASES)
+        if ahocorasick is not None
+        else None
+    )
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", backend: Optional[str] = None):
+        """
+        Args:
+            model_name: SentenceTransformer model id or path
+            backend: "torch" (default) or "onnx" for int8 ONNX Runtime
+                inference; defaults to the RAG_EMBED_BACKEND env var
+        """
+        backend = backend or os.environ.get("RAG_EMBED_BACKEND", "torch")
+        print(f"Loading embedding model: {model_name} ({backend})")
+        self.model = None
+        if backend == "onnx":
+            try:
+                self.model = SentenceTransformer(
+                    model_name,
+                    backend="onnx",
+                    model_kwargs={"file_name": os.environ.get("RAG_ONNX_FILE") or _onnx_model_file()},
+                )
+            except (ImportError, OSError, ValueError) as e:
+                # Needs sentence-transformers[onnx] and an exported model
+                print(f"ONNX backend unavailable ({e}); falling back to torch")
+        if self.model is None:
+            # Stream weights straight into the model (safetensors when the hub
+            # provides them) instead of materialising a random init first.
+            self.model = SentenceTransformer(
+                model_name, model_kwargs={"low_cpu_mem_usage": True}
+            )
+            # fp16 shifts similarities and the thresholds are calibrated on
+            # fp32, so half precision on GPU is opt-in
+            if self.model.device.type == "cuda" and os.environ.get("RAG_EMBED_FP16") == "1":
+                self.model.half()
         self.patterns: List[str] = []
         self.embeddings = None
+        self._index = None
         self.metadatas: List[Dict] = []
+        self._tokens_by_text: Dict[str, frozenset] = {}
+        # Metadata as arrays aligned with embedding rows, for gathers by index
+        self._is_attack = np.zeros(0, dtype=bool)
+        self._cat_ids = np.zeros(0, dtype=np.intp)
+        self._base_conf = np.zeros(0, dtype=np.float64)
+        self._cat_names: Tuple[str, ...] = ()
+        # Per-thread similarity buffers (Streamlit serves sessions on threads)
+        self._local = threading.local()
+        # message -> (kb_version, result); stale versions are ignored
+        self._kb_version = 0
+        self._detect_cache: "OrderedDict[str, Tuple[int, Tuple[float, str]]]" = OrderedDict()
+        # message -> read-only (1, d) query embedding; independent of the KB
+        self._embed_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         print("RAG Detector ready.")
 
     def add_patterns(self, patterns: List[Dict]):
         texts = [p["text"] for p in patterns]
-        self.embeddings = np.array(
-            self.model.encode(texts, convert_to_tensor=False, show_progress_bar=False)
-        )
+        # L2-normalise once so cosine similarity is a single matrix product
+        self.embeddings = np.ascontiguousarray(self._encode(texts))
+        if faiss is not None:
+            # Inner product over normalised rows (= cosine), stored as 8-bit
+            # codes: a quarter of the float32 bytes per scan, decoded with SIMD
+            self._index = faiss.IndexScalarQuantizer(
+                self.embeddings.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            self._index.train(self.embeddings)
+            self._index.add(self.embeddings)
         self.patterns = texts
+        # Lowercased token sets, built once at ingest so consumers of
+        # retrieve_top_k() can compare KB texts without re-tokenizing them.
+        self._tokens_by_text = {t: frozenset(_TOKEN_RE.findall(t.lower())) for t in texts}
         self.metadatas = [
             {
                 "label": p["label"],
-                "category": (
-                    "fear_threat"
-                    if p["category"] in ("psychological_coercion", "fear_threat_severe")
-                    else p["category"]
-                ),
+                # Interned: one shared object per category name, so dict lookups
+                # on the voted category compare by identity
+                "category": sys.intern(_CATEGORY_ALIASES.get(p["category"], p["category"])),
                 "base_conf": p["confidence"],
             }
             for p in patterns
         ]
+        cat_ids: Dict[str, int] = {}
+        self._cat_ids = np.array(
+            [cat_ids.setdefault(m["category"], len(cat_ids)) for m in self.metadatas], dtype=np.intp
+        )
+        self._cat_names = tuple(cat_ids)
+        self._is_attack = np.array(
+            [m["label"] == "social_engineering" for m in self.metadatas], dtype=bool
+        )
+        self._base_conf = np.array([m["base_conf"] for m in self.metadatas], dtype=np.float64)
+        self._kb_version += 1
         print(f"Knowledge base: {len(patterns)} patterns loaded.")
 
-    def detect(self, message: str) -> Tuple[float, str]:
+    def _encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Embed texts with autograd disabled; always returns float32.
+
+        Rows come back L2-normalised (all-zero rows stay zero): the encoder
+        does it on the tensor before the NumPy conversion, so no second pass.
+        """
+        with torch.inference_mode():
+            emb = self.model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        return np.asarray(emb, dtype=np.float32)
+
+    def _search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
         """
+        Rank patterns for each L2-normalised query row.
+
+        Returns (similarities, pattern indices), both shaped (n_queries, k)
+        and ordered best first.
+        """
+        n_patterns = self.embeddings.shape[0]
+        k = min(k, n_patterns)
+        if self._index is not None:
+            # The 8-bit index only shortlists candidates; rescore them exactly
+            # so reported similarities (and thresholds on them) stay float32
+            n_cand = min(k * _SQ_OVERFETCH, n_patterns)
+            _, cand = self._index.search(queries, n_cand)
+            cand = np.where(cand < 0, 0, cand)
+            scores = np.einsum("qd,qcd->qc", queries, self.embeddings[cand])
+            order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+            return np.take_along_axis(scores, order, axis=1), np.take_along_axis(cand, order, axis=1)
+
+        if queries.shape[0] == 1:
+            scores = getattr(self._local, "scores", None)
+            if scores is None or scores.shape[1] != n_patterns:
+                scores = self._local.scores = np.empty((1, n_patterns), dtype=np.float32)
+            # Matrix-vector product straight over the row-major pattern matrix
+            np.matmul(self.embeddings, queries[0], out=scores[0])
+        else:
+            scores = queries @ self.embeddings.T
+
+        # O(N) partial selection of the k best, then sort only those k
+        if k < n_patterns:
+            top_idx = np.argpartition(-scores, k, axis=1)[:, :k]
+        else:
+            top_idx = np.broadcast_to(np.arange(n_patterns), scores.shape)
+        top_scores = np.take_along_axis(scores, top_idx, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top_idx, order, axis=1)
+
+    def _encode_query(self, message: str) -> np.ndarray:
+        """Embed one message as a (1, d) row, memoised per message text."""
+        if len(message) > _DETECT_CACHE_MAX_LEN:
+            return self._encode([message])
+
+        with self._cache_lock:
+            emb = self._embed_cache.get(message)
+            if emb is not None:
+                self._embed_cache.move_to_end(message)
+                return emb
+
+        emb = self._encode([message])
+        emb.setflags(write=False)  # shared between callers
+        with self._cache_lock:
+            self._embed_cache[message] = emb
+            self._embed_cache.move_to_end(message)
+            if len(self._embed_cache) > _EMBED_CACHE_SIZE:
+                self._embed_cache.popitem(last=False)
+        return emb
+
+    def _rank(self, message: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (top-k similarities, top-k pattern indices), best first."""
+        top_scores, top_idx = self._search(self._encode_query(message), k)
+        return top_scores[0], top_idx[0]
+
+    def _scan_keywords(self, msg: str) -> Tuple[int, bool, bool]:
+        """Return (n_threat, has_deadline, is_safe_ctx) for a lowercased message."""
+        tokens = frozenset(_TOKEN_RE.findall(msg))
+        threat_words = _word_hits(tokens, self._THREAT_WORDS, self._THREAT_LENS)
+        deadline_word = bool(_word_hits(tokens, self._DEADLINE_WORDS, self._DEADLINE_LENS))
+        if self._PHRASE_AC is not None:
+            threat_phrases, deadline_phrase, safe_phrase = self._scan_phrases(msg)
+            n_threat = len(threat_words) + len(threat_phrases)
+            has_deadline = deadline_phrase or deadline_word
+            is_safe_ctx = n_threat == 0 and (
+                safe_phrase or bool(_word_hits(tokens, self._SAFE_WORDS, self._SAFE_LENS))
+            )
+            return n_threat, has_deadline, is_safe_ctx
+
+        n_threat = len(threat_words) + len(set(self._THREAT_RE.findall(msg)))
+        has_deadline = deadline_word or self._DEADLINE_RE.search(msg) is not None
+        is_safe_ctx = n_threat == 0 and (
+            bool(_word_hits(tokens, self._SAFE_WORDS, self._SAFE_LENS))
+            or self._SAFE_RE.search(msg) is not None
+        )
+        return n_threat, has_deadline, is_safe_ctx
+
+    def _scan_phrases(self, msg: str) -> Tuple[set, bool, bool]:
+        """
+        One automaton pass for all phrase lists.
+
+        Returns (distinct threat phrases, any deadline phrase, any safe
+        phrase). Hits not starting at a word boundary are dropped and threat
+        hits are resolved leftmost-longest without overlap, exactly as
+        _THREAT_RE.findall() would report them.
+        """
+        threat_hits = []
+        deadline_phrase = safe_phrase = False
+        for end, (mask, length) in self._PHRASE_AC.iter(msg):
+            start = end - length + 1
+            if start > 0 and _is_word_char(msg[start - 1]):
+                continue
+            if mask & 1:
+                threat_hits.append((start, -length))
+            if mask & 2:
+                deadline_phrase = True
+            if mask & 4:
+                safe_phrase = True
+
+        threat_phrases = set()
+        last_end = 0
+        for start, neg_length in sorted(threat_hits):
+            if start >= last_end:
+                last_end = start - neg_length
+                threat_phrases.add(msg[start:last_end])
+        return threat_phrases, deadline_phrase, safe_phrase
+
+    def detect(self, message: str, message_lower: Optional[str] = None) -> Tuple[float, str]:
+        """
+        Args:
+            message: raw message text
+            message_lower: message.lower(), if the caller already has it
+
         Returns:
             rag_confidence: float 0-100 (probability message is malicious)
             voted_category: str (neighbor-voted category signal)
         """
-        emb = self.model.encode([message], show_progress_bar=False)[0].reshape(1, -1)
-        scores = _vector_match(emb, self.embeddings)[0]
-        top_idx = np.argsort(scores)[::-1][:5]
-        top_score = float(scores[top_idx[0]]) if top_idx.size else 0.0
+        if len(message) > _DETECT_CACHE_MAX_LEN:
+            return self._detect(message, message_lower)
+
+        version = self._kb_version
+        with self._cache_lock:
+            entry = self._detect_cache.get(message)
+            if entry is not None and entry[0] == version:
+                self._detect_cache.move_to_end(message)
+                return entry[1]
+
+        result = self._detect(message, message_lower)
+        with self._cache_lock:
+            self._detect_cache[message] = (version, result)
+            self._detect_cache.move_to_end(message)
+            if len(self._detect_cache) > _DETECT_CACHE_SIZE:
+                self._detect_cache.popitem(last=False)
+        return result
+
+    def detect_batch(self, messages: List[str]) -> List[Tuple[float, str]]:
+        """
+        Batched detect(): one encoder call and one search for all messages.
+
+        Results match calling detect() on each message. The encoder already
+        length-sorts inputs within a call, so padding stays minimal.
+        """
+        if not messages:
+            return []
+        queries = self._encode(messages, batch_size=64)
+        top_scores, top_idx = self._search(queries, 5)
+        flags = [self._scan_keywords(m.lower()) for m in messages]
+        return self._score_rows(flags, top_scores, top_idx)
+
+    def _detect(self, message: str, message_lower: Optional[str] = None) -> Tuple[float, str]:
+        if message_lower is None:
+            message_lower = message.lower()
+        top_scores, top_idx = self._rank(message, 5)
+        return self._score(self._scan_keywords(message_lower), top_scores, top_idx)
+
+    def _score(
+        self, flags: Tuple[int, bool, bool], top_scores: np.ndarray, top_idx: np.ndarray
+    ) -> Tuple[float, str]:
+        """
+        Turn one message's top-5 neighbours into (rag_confidence, voted_category).
 
-        msg = message.lower()
-        n_threat = sum(1 for kw in self.THREAT_KW if kw in msg)
-        has_deadline = any(kw in msg for kw in self.DEADLINE_KW)
-        is_safe_ctx = any(p in msg for p in self.SAFE_CONTEXT) and n_threat == 0
+        Scalar twin of _score_kernel(): for a single row, plain arithmetic
+        is several times faster than the array kernel's fixed overhead.
+        """
+        n_threat, has_deadline, is_safe_ctx = flags
+        top_score = float(top_scores[0]) if top_idx.size else 0.0
 
         # Convert top embedding score to malicious probability
         if top_score <= 0:
             prob = 0.0
         else:
-            prob = 1.0 / (1.0 + math.exp(-9.0 * (top_score - 0.40)))
-            prob *= 0.92
+            idx = min(int(top_score * _SIGMOID_STEPS + 0.5), _SIGMOID_STEPS)
+            prob = float(_SIGMOID_LUT[idx])
 
         if top_score < 0.30:
             prob = min(prob, 0.15)
@@ -99,9 +522,8 @@ class RAGSocialEngineeringDetector:
             prob = min(prob, 0.25)
 
         # Neighbor agreement
-        metas = [self.metadatas[i] for i in top_idx]
-        n_attack = sum(1 for m in metas if m["label"] == "social_engineering")
-        agreement = n_attack / max(len(metas), 1)
+        attack = self._is_attack[top_idx]
+        agreement = int(attack.sum()) / max(top_idx.size, 1)
         if agreement >= 0.7 and prob > 0.20:
             prob = min(prob * 1.18, 0.95)
 
@@ -115,33 +537,56 @@ class RAGSocialEngineeringDetector:
         elif n_threat >= 1:
             prob = max(prob, 0.40)
 
-        # Neighbor vote for category
-        cat_scores: Dict[str, float] = {}
-        for i in top_idx:
-            m = self.metadatas[i]
-            s = float(scores[i])
-            cat = m["category"]
-            if cat in ("psychological_coercion", "fear_threat_severe"):
-                cat = "fear_threat"
-            if m["label"] == "social_engineering":
-                cat_scores[cat] = cat_scores.get(cat, 0.0) + s * m["base_conf"]
-
-        voted_cat = max(cat_scores, key=cat_scores.get) if cat_scores else "unknown"
+        # Neighbor vote for category: similarity * base confidence summed per
+        # category over attack neighbours. Ties go to the category that
+        # appears first in rank order.
+        voted_cat = "unknown"
+        if attack.any():
+            attack_idx = top_idx[attack]
+            cats = self._cat_ids[attack_idx]
+            weights = top_scores[attack].astype(np.float64) * self._base_conf[attack_idx]
+            totals = np.bincount(cats, weights=weights, minlength=len(self._cat_names))[cats]
+            voted_cat = self._cat_names[cats[int(totals.argmax())]]
         rag_confidence = round(max(0.0, min(100.0, prob * 100)), 2)
 
         return rag_confidence, voted_cat
 
+    def _score_rows(
+        self, flags: List[Tuple[int, bool, bool]], top_scores: np.ndarray, top_idx: np.ndarray
+    ) -> List[Tuple[float, str]]:
+        """
+        Score (n, k) neighbour rows for n messages' _scan_keywords() flags in
+        one kernel call. Used by detect_batch(); single messages go through
+        _score(), as the kernel only pays off across many rows.
+        """
+        probs, cat_ids = _score_kernel(
+            top_scores,
+            top_idx,
+            self._is_attack,
+            self._cat_ids,
+            self._base_conf,
+            len(self._cat_names),
+            np.array([f[0] for f in flags], dtype=np.intp),
+            np.array([f[1] for f in flags], dtype=bool),
+            np.array([f[2] for f in flags], dtype=bool),
+        )
+        return [
+            (
+                round(max(0.0, min(100.0, prob * 100)), 2),
+                self._cat_names[cat] if cat >= 0 else "unknown",
+            )
+            for prob, cat in zip(probs.tolist(), cat_ids.tolist())
+        ]
+
     def retrieve_top_k(self, message: str, k: int = 5) -> List[Dict]:
         """
         Returns top-k similar knowledge base examples with metadata.
         This is read-only retrieval for explainability and does not affect scoring.
         """
-        emb = self.model.encode([message], show_progress_bar=False)[0].reshape(1, -1)
-        scores = _vector_match(emb, self.embeddings)[0]
-        top_idx = np.argsort(scores)[::-1][:k]
+        top_scores, top_idx = self._rank(message, k)
 
         results: List[Dict] = []
-        for i in top_idx:
+        for i, sim in zip(top_idx.tolist(), top_scores.tolist()):
             meta = self.metadatas[i]
             results.append(
                 {
@@ -149,17 +594,28 @@ class RAGSocialEngineeringDetector:
                     "label": meta["label"],
                     "category": meta["category"],
                     "base_confidence": meta["base_conf"],
-                    "similarity": round(float(scores[i]), 4),
+                    "similarity": round(sim, 4),
                 }
             )
 
         return results
 
+    def pattern_tokens(self, text: str) -> Optional[frozenset]:
+        """Lowercased token set of a knowledge base text, or None if it is not one."""
+        return self._tokens_by_text.get(text)
+
 
 _instance = None
 
 
 def get_detector() -> RAGSocialEngineeringDetector:
+    """
+    Return the process-wide detector, loading the model on first use.
+
+    Prefork servers should call this once in the parent before forking
+    (e.g. gunicorn --preload) so workers share the read-only weights
+    copy-on-write instead of each loading their own copy.
+    """
     global _instance
     if _instance is None:
         _instance = RAGSocialEngineeringDetector()
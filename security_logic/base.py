@@ -1,9 +1,22 @@
-from dataclasses import dataclass
-from typing import List
+import functools
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+# Per-analyzer result cache: entries kept, and longest text cached
+_ANALYZE_CACHE_SIZE = 4096
+_ANALYZE_CACHE_MAX_LEN = 8192
 
 @dataclass
 class SignalResult:
     """Result of a social engineering detection signal analysis."""
+    # No per-instance __dict__: one is built for every analyzer call.
+    # (dataclass(slots=True) needs Python 3.10.)
+    __slots__ = ("signal_name", "score", "confidence", "evidence")
+
     signal_name: str
     score: float  # 0.0 to 1.0
     confidence: float  # 0.0 to 1.0
@@ -22,3 +35,216 @@ def analyze(text: str) -> SignalResult:
     Each signal module must implement this function.
     """
     raise NotImplementedError
+
+
+def memoize_analyzer(
+    analyze: Callable[[str, Optional[str]], SignalResult]
+) -> Callable[[str, Optional[str]], SignalResult]:
+    """
+    Wrap a signal analyzer with an LRU cache keyed by text.
+
+    Analyzers are pure functions of the text, so repeated messages skip the
+    pattern scans. Hits return a copy with a fresh evidence list, as callers
+    may extend it. Non-str and very long texts bypass the cache. The wrapper
+    exposes cache_clear().
+    """
+    cache: "OrderedDict[str, SignalResult]" = OrderedDict()
+    lock = threading.Lock()
+
+    @functools.wraps(analyze)
+    def wrapper(text: str, text_lower: Optional[str] = None) -> SignalResult:
+        if not isinstance(text, str) or len(text) > _ANALYZE_CACHE_MAX_LEN:
+            return analyze(text, text_lower)
+        with lock:
+            result = cache.get(text)
+            if result is not None:
+                cache.move_to_end(text)
+        if result is None:
+            result = analyze(text, text_lower)
+            with lock:
+                cache[text] = result
+                if len(cache) > _ANALYZE_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return replace(result, evidence=list(result.evidence))
+
+    def cache_clear() -> None:
+        with lock:
+            cache.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+# Smallest positive float. As the first confidence threshold it gives
+# scores of exactly 0.0 (scores are never negative) a bucket of their own.
+NONZERO_SCORE = 5e-324
+
+
+def score_confidence(
+    score: float,
+    thresholds: Tuple[float, ...],
+    confidences: Tuple[float, ...] = (0.5, 0.6, 0.75, 0.9),
+) -> float:
+    """
+    Map a score to its confidence bucket.
+
+    thresholds are ascending bucket lower bounds: a score below
+    thresholds[0] gets confidences[0], one at or above thresholds[i] but
+    below thresholds[i + 1] gets confidences[i + 1].
+    """
+    return confidences[bisect_right(thresholds, score)]
+
+
+class GapPattern(str):
+    """
+    Regex text ``t1.*t2.*...`` for terms that must appear in order on a line.
+
+    A GapPattern is the plain regex string, so prefilters and callers that
+    compile it themselves see the usual pattern. compile_each() and
+    compile_union() match it with a GapMatcher instead.
+    """
+
+    def __new__(cls, *terms: str) -> "GapPattern":
+        pattern = super().__new__(cls, ".*".join(terms))
+        pattern.terms = terms
+        return pattern
+
+
+class GapMatch:
+    """Span of a GapMatcher match, with the re.Match accessors callers use."""
+    __slots__ = ("string", "_start", "_end")
+
+    def __init__(self, string: str, start: int, end: int):
+        self.string = string
+        self._start = start
+        self._end = end
+
+    def group(self) -> str:
+        return self.string[self._start:self._end]
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def span(self) -> Tuple[int, int]:
+        return self._start, self._end
+
+
+class _Cursor:
+    """Next match of one regex in a text, searched again only once passed."""
+    __slots__ = ("regex", "text", "pos", "match")
+
+    def __init__(self, regex: re.Pattern, text: str):
+        self.regex = regex
+        self.text = text
+        self.pos = -1
+        self.match = None
+
+    def first_at(self, pos: int) -> Optional[re.Match]:
+        """First match starting at or after pos."""
+        match = self.match
+        if not (0 <= self.pos <= pos and (match is None or match.start() >= pos)):
+            match = self.match = self.regex.search(self.text, pos)
+            self.pos = pos
+        return match
+
+
+_NEWLINE = re.compile("\n")
+
+
+class GapMatcher:
+    """
+    Match a GapPattern in time linear in the text length.
+
+    The regex engine retries the rest of the line after every lead term,
+    which is quadratic on long texts with many lead terms. Here each term
+    is searched forward from where the previous one ended, and a term's
+    next occurrence is reused while it still lies ahead, so each term scans
+    the text about once. As `.` does not match newlines, each term must
+    start on the line where the previous one ended. Matches start where the
+    regex's do and, like the greedy .*, end after the last occurrence of
+    the final term on its line.
+    """
+
+    def __init__(self, pattern: GapPattern, flags: int = 0):
+        self.pattern = pattern
+        self._terms = compile_each(pattern.terms, flags)
+
+    def search(self, text: str) -> Optional[GapMatch]:
+        return next(self.finditer(text), None)
+
+    def finditer(self, text: str) -> Iterator[GapMatch]:
+        newline = _Cursor(_NEWLINE, text)
+        cursors = [_Cursor(term, text) for term in self._terms]
+        pos = 0
+        while True:
+            lead = cursors[0].first_at(pos)
+            if lead is None:
+                return
+            match = lead
+            for cursor in cursors[1:]:
+                line_break = newline.first_at(match.end())
+                line_end = len(text) if line_break is None else line_break.start()
+                match = cursor.first_at(match.end())
+                # No later term anywhere: no later lead can match either
+                if match is None:
+                    return
+                if match.start() > line_end:
+                    break
+            else:
+                # Greedy .*: extend to the last final term on the line
+                following = cursors[-1].first_at(match.start() + 1)
+                while following is not None and following.start() <= line_end:
+                    match = following
+                    following = cursors[-1].first_at(match.start() + 1)
+                yield GapMatch(text, lead.start(), match.end())
+                pos = match.end()
+                continue
+            pos = lead.start() + 1
+
+
+class GapUnion:
+    """A compiled union plus GapMatchers; search() finds a match of any of them."""
+
+    def __init__(self, union: Optional[re.Pattern], gaps: Tuple[GapMatcher, ...]):
+        self._union = union
+        self._gaps = gaps
+
+    def search(self, text: str) -> Union[re.Match, GapMatch, None]:
+        if self._union is not None:
+            match = self._union.search(text)
+            if match is not None:
+                return match
+        for gap in self._gaps:
+            match = gap.search(text)
+            if match is not None:
+                return match
+        return None
+
+
+def compile_union(patterns: List[str], flags: int = 0) -> Union[re.Pattern, GapUnion]:
+    """
+    Join regex patterns into a single alternation.
+
+    One search of the union finds a match wherever any single pattern
+    would, but walks the text once instead of once per pattern. GapPatterns
+    are matched separately, by their GapMatcher.
+    """
+    gaps = tuple(GapMatcher(p, flags) for p in patterns if isinstance(p, GapPattern))
+    if not gaps:
+        return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+    plain = [p for p in patterns if not isinstance(p, GapPattern)]
+    union = re.compile("|".join(f"(?:{p})" for p in plain), flags) if plain else None
+    return GapUnion(union, gaps)
+
+
+def compile_each(
+    patterns: List[str], flags: int = 0
+) -> Tuple[Union[re.Pattern, GapMatcher], ...]:
+    """Compile each regex pattern once, at import, for per-pattern matching."""
+    return tuple(
+        GapMatcher(p, flags) if isinstance(p, GapPattern) else re.compile(p, flags)
+        for p in patterns
+    )
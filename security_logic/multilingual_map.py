@@ -4,6 +4,9 @@ Maps non-English phishing keywords to English equivalents.
 Used for detection without modifying original text signals.
 """
 
+import functools
+import re
+
 # ---------------------------
 # KEYWORD MAPPING
 # ---------------------------
@@ -392,24 +395,51 @@ ZERO_WIDTH_CHARS = [
     "\u180e",  # Mongolian vowel separator
 ]
 
+# Translation tables built once at import. Every key is a single character
+# and no replacement contains another key, so one translate() pass gives
+# the same result as replacing each entry in turn.
+_DEOBFUSCATE_TABLE = str.maketrans({**dict.fromkeys(ZERO_WIDTH_CHARS), **HOMOGLYPH_MAP})
+_SYMBOL_TABLE = str.maketrans(SYMBOL_MAP)
+
+# Inline punctuation noise: anything but word characters, "." and
+# whitespace, plus "_" (word character, but dropped like "-")
+_NOISE_RE = re.compile(r"[^\w.\s]|_")
+
+# Normalisation result caches: entries kept, and longest text cached. The
+# length cap bounds the memory one entry (text and result) can hold.
+_NORMALIZE_CACHE_SIZE = 4096
+_NORMALIZE_CACHE_MAX_LEN = 2048
+
+
+def _short_text_cache(func):
+    """
+    LRU-cache a function of one text, bypassing the cache for long texts.
+
+    The wrapper exposes cache_clear() and cache_info() like lru_cache.
+    """
+    cached = functools.lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)(func)
 
+    @functools.wraps(func)
+    def wrapper(text):
+        if len(text) > _NORMALIZE_CACHE_MAX_LEN:
+            return func(text)
+        return cached(text)
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+@_short_text_cache
 def normalize_obfuscation(text: str) -> str:
     """
     Normalize obfuscated text (spacing tricks, symbol substitutions, noise).
     Run BEFORE multilingual normalization.
     Handles: leet speak, homoglyphs, zero-width chars, spacing tricks.
     """
-    result = text
-    
-    # 0. Remove zero-width and invisible characters FIRST
-    for zw_char in ZERO_WIDTH_CHARS:
-        result = result.replace(zw_char, "")
-    
-    # 1. Apply homoglyph substitutions (before lowercasing to catch uppercase)
-    for homoglyph, latin in HOMOGLYPH_MAP.items():
-        result = result.replace(homoglyph, latin)
-    
-    result = result.lower()
+    # 0. Remove zero-width and invisible characters, and
+    # 1. apply homoglyph substitutions (before lowercasing to catch uppercase)
+    result = text.translate(_DEOBFUSCATE_TABLE).lower()
     
     # 2. Collapse single-character spacing ("v e r i f y" → "verify")
     words = result.split()
@@ -434,23 +464,14 @@ def normalize_obfuscation(text: str) -> str:
     result = " ".join(collapsed_words)
     
     # 3. Apply symbol substitutions (leet speak)
-    for symbol, letter in SYMBOL_MAP.items():
-        result = result.replace(symbol, letter)
-    
-    # 4. Remove inline punctuation noise (keep word boundaries)
-    cleaned_words = []
-    for word in result.split():
-        clean = ""
-        for char in word:
-            if char.isalnum() or char in ".-_":
-                clean += char
-        clean = clean.replace("-", "").replace("_", "")
-        if clean:
-            cleaned_words.append(clean)
+    result = result.translate(_SYMBOL_TABLE)
     
-    return " ".join(cleaned_words)
+    # 4. Remove inline punctuation noise (keep word boundaries); words left
+    # empty disappear in the split
+    return " ".join(_NOISE_RE.sub("", result).split())
 
 
+@_short_text_cache
 def normalize_text(text: str) -> tuple:
     """
     Normalize non-English keywords to English equivalents.
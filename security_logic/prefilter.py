@@ -0,0 +1,229 @@
+"""
+Literal prefilters for regex pattern sets.
+
+required_literals() walks a pattern's parse tree and returns strings of
+which every match must contain at least one. OR-ing those sets over a
+pattern list gives a cheap gate: lowercased ASCII text containing none of
+them cannot match any pattern in the list, whatever its case flags.
+
+The parse tree comes from CPython's private regex parser. If it cannot be
+imported, raises, or fails a self-check at import, no literals are
+derived: gates come back None and analyzers always run.
+"""
+
+import re
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple
+
+try:  # Python 3.11+
+    from re import _constants as _sre
+    from re import _parser as _sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    try:
+        import sre_constants as _sre
+        import sre_parse as _sre_parse
+    except ImportError:
+        _sre = _sre_parse = None
+
+# Cap on how many alternative strings one literal set may expand to
+_MAX_EXPANSION = 64
+
+
+def _product(left: Set[str], right: Set[str]) -> Optional[Set[str]]:
+    if len(left) * len(right) > _MAX_EXPANSION:
+        return None
+    return {a + b for a in left for b in right}
+
+
+def _node_strings(op, av) -> Optional[Set[str]]:
+    """Every string a node can match, if that is a small finite set."""
+    if op is _sre.LITERAL:
+        return {chr(av)}
+    if op is _sre.AT:
+        return {""}  # zero-width: contributes nothing to the matched text
+    if op is _sre.IN:
+        chars = set()
+        for item_op, item_av in av:
+            if item_op is not _sre.LITERAL:
+                return None
+            chars.add(chr(item_av))
+        return chars
+    if op is _sre.SUBPATTERN:
+        return _seq_strings(av[-1])
+    if op is _sre.BRANCH:
+        out: Set[str] = set()
+        for branch in av[1]:
+            strings = _seq_strings(branch)
+            if strings is None:
+                return None
+            out |= strings
+        return out if len(out) <= _MAX_EXPANSION else None
+    if op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT):
+        low, high, sub = av
+        strings = _seq_strings(sub)
+        if strings is None or high > 3:
+            return None
+        out = set()
+        acc = {""}
+        for count in range(high + 1):
+            if count >= low:
+                out |= acc
+            if count < high:
+                acc = _product(acc, strings)
+                if acc is None:
+                    return None
+        return out if len(out) <= _MAX_EXPANSION else None
+    return None
+
+
+def _seq_strings(items) -> Optional[Set[str]]:
+    acc = {""}
+    for op, av in items:
+        strings = _node_strings(op, av)
+        if strings is None:
+            return None
+        acc = _product(acc, strings)
+        if acc is None:
+            return None
+    return acc
+
+
+def _node_prefixes(op, av) -> Optional[Set[str]]:
+    """Strings one of which every match of a node starts with."""
+    strings = _node_strings(op, av)
+    if strings is not None:
+        return strings
+    if op is _sre.SUBPATTERN:
+        return _seq_prefixes(av[-1])
+    if op is _sre.BRANCH:
+        out: Set[str] = set()
+        for branch in av[1]:
+            prefixes = _seq_prefixes(branch)
+            if prefixes is None:
+                return None
+            out |= prefixes
+        return out if len(out) <= _MAX_EXPANSION else None
+    return None
+
+
+def _seq_prefixes(items) -> Optional[Set[str]]:
+    acc = {""}
+    for op, av in items:
+        strings = _node_strings(op, av)
+        if strings is None:
+            prefixes = _node_prefixes(op, av)
+            if prefixes is not None:
+                acc = _product(acc, prefixes) or acc
+            return acc
+        acc = _product(acc, strings)
+        if acc is None:
+            return None
+    return acc
+
+
+def _selectivity(literals: Set[str]) -> Tuple[int, int]:
+    """Rank literal sets: longer shortest member first (punctuation counts
+    triple, being rarer than letters), then fewer members."""
+    shortest = min(sum(1 if ch.isalnum() else 3 for ch in lit) for lit in literals)
+    return shortest, -len(literals)
+
+
+def _seq_required(items) -> Optional[Set[str]]:
+    """The most selective literal set every match of a sequence contains."""
+    best: Optional[Set[str]] = None
+
+    def consider(literals: Optional[Set[str]]) -> None:
+        nonlocal best
+        if not literals or "" in literals:
+            return
+        if best is None or _selectivity(literals) > _selectivity(best):
+            best = literals
+
+    run = {""}  # strings the current run of finite nodes can match
+    for op, av in items:
+        strings = _node_strings(op, av)
+        if strings is not None:
+            extended = _product(run, strings)
+            if extended is not None:
+                run = extended
+                continue
+            consider(run)
+            run = strings
+            continue
+        prefixes = _node_prefixes(op, av)
+        if prefixes and "" not in prefixes and run != {""}:
+            consider(_product(run, prefixes))
+        consider(run)
+        run = {""}
+        consider(_node_required(op, av))
+    consider(run)
+    return best
+
+
+def _node_required(op, av) -> Optional[Set[str]]:
+    if op is _sre.SUBPATTERN:
+        return _seq_required(av[-1])
+    if op is _sre.BRANCH:
+        out: Set[str] = set()
+        for branch in av[1]:
+            literals = _seq_required(branch)
+            if literals is None:
+                return None
+            out |= literals
+        return out
+    if op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT, getattr(_sre, "POSSESSIVE_REPEAT", None)):
+        low, _high, sub = av
+        return _seq_required(sub) if low >= 1 else None
+    return None
+
+
+def required_literals(pattern: str) -> Optional[FrozenSet[str]]:
+    """
+    Return literals of which every match of pattern contains at least one,
+    or None if no such set can be derived (e.g. the pattern is all classes).
+    """
+    if not _PARSER_OK:
+        return None
+    return _derive_literals(pattern)
+
+
+def _derive_literals(pattern: str) -> Optional[FrozenSet[str]]:
+    if _sre_parse is None:
+        return None
+    try:
+        literals = _seq_required(_sre_parse.parse(pattern))
+    except Exception:
+        # Parse tree layout changed (or the pattern is invalid): derive
+        # nothing rather than risk a gate that skips real matches
+        return None
+    return frozenset(literals) if literals else None
+
+
+# Known answers for the parse-tree walk, checked once at import
+_SELF_CHECK = (
+    (r"\bfoo\s+(?:bar|baz)\b", {"foo"}),
+    (r"\b(?:earn|make)\s+\$?\d+", {"earn", "make"}),
+    (r"\d+\s*%", {"%"}),
+    (r"[a-z]+", None),
+)
+_PARSER_OK = all(
+    _derive_literals(pattern) == (frozenset(expected) if expected else None)
+    for pattern, expected in _SELF_CHECK
+)
+
+
+def literal_gate(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """
+    Compile one alternation of every pattern's required literals, lowercased.
+
+    Search it on text.lower() of ASCII text: no hit means no pattern in the
+    list can match, with or without re.IGNORECASE. Returns None if some
+    pattern has no required literal, in which case nothing can be skipped.
+    """
+    literals: Set[str] = set()
+    for pattern in patterns:
+        required = required_literals(pattern)
+        if required is None:
+            return None
+        literals.update(lit.lower() for lit in required)
+    ordered: List[str] = sorted(literals, key=len, reverse=True)
+    return re.compile("|".join(re.escape(lit) for lit in ordered))
@@ -1,10 +1,51 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from math import pow
+from typing import List, Optional
+
+from .base import SignalResult
+from .prefilter import literal_gate
+from .signals import authority, fear_threat, impersonation, reward_lure, urgency
 from .signals.urgency import analyze as analyze_urgency
 from .signals.authority import analyze as analyze_authority
 from .signals.impersonation import analyze as analyze_impersonation
 from .signals.reward_lure import analyze as analyze_reward_lure
 from .signals.fear_threat import analyze as analyze_fear_threat
 
+# Literals at least one of which every signal pattern needs. Lowercased
+# ASCII text without any of them cannot trigger a signal, so it skips the
+# analyzers (None if some pattern has no required literal: never skip).
+_SIGNAL_GATE = literal_gate(
+    urgency.ALL_PATTERNS
+    + authority.ALL_PATTERNS
+    + impersonation.ALL_PATTERNS
+    + reward_lure.ALL_PATTERNS
+    + fear_threat.ALL_PATTERNS
+)
+
+# Canonical signal order: analyzers run, and the tuples below are indexed, in it
+_SIGNAL_ORDER = ("urgency", "authority", "impersonation", "reward_lure", "fear_threat")
+
+# Signal activation thresholds (impersonation intentionally stricter)
+_THRESHOLDS = (0.2, 0.25, 0.4, 0.15, 0.2)
+
+# Signal weight importance
+_WEIGHTS = (1.0, 1.1, 1.4, 0.8, 1.2)
+
+# Messages per worker task in analyze_texts(); below one chunk per worker
+# the process start-up costs more than it saves
+_BATCH_CHUNK = 64
+
+
+def _strength_tier(score: float) -> str:
+    """Strength tier of a signal score: high from 0.6, medium from 0.35."""
+    if score >= 0.6:
+        return "high"
+    elif score >= 0.35:
+        return "medium"
+    else:
+        return "low"
+
 
 def analyze_text(text: str) -> dict:
     """
@@ -23,46 +64,31 @@ def analyze_text(text: str) -> dict:
         }
     """
 
-    # -----------------------------
-    # Signal activation thresholds
-    # -----------------------------
-    ACTIVATION_THRESHOLDS = {
-        "urgency": 0.2,
-        "authority": 0.25,
-        "impersonation": 0.4,     # intentionally stricter
-        "reward_lure": 0.15,
-        "fear_threat": 0.2,
-    }
-
-    # -----------------------------
-    # Signal weight importance
-    # -----------------------------
-    WEIGHTS = {
-        "urgency": 1.0,
-        "authority": 1.1,
-        "impersonation": 1.4,
-        "reward_lure": 0.8,
-        "fear_threat": 1.2,
-    }
-
-    def strength_tier(score: float) -> str:
-        if score >= 0.6:
-            return "high"
-        elif score >= 0.35:
-            return "medium"
-        else:
-            return "low"
-
     # -----------------------------
     # Run analyzers
     # -----------------------------
-    signal_results = [
-        analyze_urgency(text),
-        analyze_authority(text),
-        analyze_impersonation(text),
-        analyze_reward_lure(text),
-        analyze_fear_threat(text),
-    ]
+    # Lowercase once and share it; every analyzer matches case-insensitively
+    text_lower = text.lower() if isinstance(text, str) else text
+
+    if (
+        _SIGNAL_GATE is not None
+        and isinstance(text, str)
+        and text.isascii()
+        and _SIGNAL_GATE.search(text_lower) is None
+    ):
+        # Nothing can match: the same empty results the analyzers return
+        signal_results = [
+            SignalResult(signal_name=name, score=0.0, confidence=0.5, evidence=[])
+            for name in _SIGNAL_ORDER
+        ]
+    else:
+        signal_results = [
+            analyze_urgency(text, text_lower),
+            analyze_authority(text, text_lower),
+            analyze_impersonation(text, text_lower),
+            analyze_reward_lure(text, text_lower),
+            analyze_fear_threat(text, text_lower),
+        ]
 
     per_signal_breakdown = {}
     active_signals = []
@@ -71,31 +97,32 @@ def analyze_text(text: str) -> dict:
     # -----------------------------
     # Process signals
     # -----------------------------
+    # Results are in _SIGNAL_ORDER, so they line up with the threshold and
+    # weight tuples. Analyzers already return scores rounded to at most 3
+    # places and confidences from a fixed set of buckets.
     weighted_sum = 0.0
+    active_results = []
 
-    for result in signal_results:
+    for result, threshold, weight in zip(signal_results, _THRESHOLDS, _WEIGHTS):
         name = result.signal_name
-        score = float(result.score)
-        confidence = float(result.confidence)
-        evidence = result.evidence
-
-        threshold = ACTIVATION_THRESHOLDS.get(name, 0.25)
+        score = result.score
         is_active = score >= threshold
-        strength = strength_tier(score)
+        strength = _strength_tier(score)
 
         if is_active:
             active_signals.append(name)
-            weighted_sum += score * WEIGHTS.get(name, 1.0)
+            active_results.append(result)
+            weighted_sum += score * weight
 
             if strength == "high":
                 strong_signals.append(name)
 
         per_signal_breakdown[name] = {
-            "score": round(score, 3),
-            "confidence": round(confidence, 3),
+            "score": score,
+            "confidence": result.confidence,
             "strength": strength,
             "is_active": is_active,
-            "evidence": evidence,
+            "evidence": result.evidence,
         }
 
     # -----------------------------
@@ -112,10 +139,8 @@ def analyze_text(text: str) -> dict:
     # -----------------------------
     primary_category = None
     if active_signals:
-        primary_category = max(
-            [r for r in signal_results if r.signal_name in active_signals],
-            key=lambda r: r.score,
-        ).signal_name
+        # Highest-scoring active signal; ties go to the earlier signal
+        primary_category = max(active_results, key=lambda r: r.score).signal_name
 
     # -----------------------------
     # Escalation Logic
@@ -152,9 +177,7 @@ def analyze_text(text: str) -> dict:
     if not active_signals:
         rule_confidence = 0.5
     else:
-        avg_conf = sum(
-            r.confidence for r in signal_results if r.signal_name in active_signals
-        ) / len(active_signals)
+        avg_conf = sum(r.confidence for r in active_results) / len(active_results)
 
         signal_factor = min(len(active_signals) / 3, 1.0)
 
@@ -183,3 +206,25 @@ def analyze_text(text: str) -> dict:
         "per_signal_breakdown": per_signal_breakdown,
         "combined_evidence": combined_evidence,
     }
+
+
+def analyze_texts(texts: List[str], max_workers: Optional[int] = None) -> List[dict]:
+    """
+    analyze_text() over many messages, in worker processes when it pays off.
+
+    The analyzers are pure-Python regex work that holds the GIL, so threads
+    cannot overlap them; parallelism is across processes, one chunk of
+    messages per task. Runs in-process for a single worker or a small batch.
+
+    Args:
+        texts: messages to analyze
+        max_workers: process count (default: os.cpu_count())
+
+    Returns:
+        analyze_text() results, in input order
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(texts) < 2 * _BATCH_CHUNK:
+        return [analyze_text(text) for text in texts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_text, texts, chunksize=_BATCH_CHUNK))
@@ -1,6 +1,6 @@
 import re
-from typing import List
-from ..base import SignalResult
+from typing import Dict, List, Optional, Tuple
+from ..base import NONZERO_SCORE, SignalResult, memoize_analyzer, score_confidence
 
 """Authority-based social engineering detection signal."""
 
@@ -60,24 +60,80 @@ DIRECTIVE_PATTERNS = [
     r'\b(acting\s+under\s+authority)\b',
 ]
 
+# Every pattern analyze() can match, for prefilters
+ALL_PATTERNS = (
+    AUTHORITY_TITLES + AUTHORITY_DEPARTMENTS + AUTHORITY_ORGANIZATIONS + BEC_PATTERNS + DIRECTIVE_PATTERNS
+)
+
+
+def _compile_category(patterns: List[str]) -> Tuple[re.Pattern, Dict[int, Tuple[int, int]]]:
+    """
+    Union-compile a pattern list so a text is scanned once per category.
+
+    Each pattern becomes one capturing alternative inside a lookahead, so
+    matches of different patterns may still overlap. The returned map goes
+    from an alternative's group number to (pattern index, reported group):
+    the pattern's first capture group, or the whole alternative if none.
+    """
+    parts = []
+    alternatives = {}
+    group = 0
+    for index, pattern in enumerate(patterns):
+        inner_groups = re.compile(pattern).groups
+        group += 1
+        parts.append(f"({pattern})")
+        alternatives[group] = (index, group + 1 if inner_groups else group)
+        group += inner_groups
+    return re.compile("(?=" + "|".join(parts) + ")", re.IGNORECASE), alternatives
+
+
+_TITLES_UNION = _compile_category(AUTHORITY_TITLES)
+_DEPARTMENTS_UNION = _compile_category(AUTHORITY_DEPARTMENTS)
+_ORGANIZATIONS_UNION = _compile_category(AUTHORITY_ORGANIZATIONS)
+_BEC_UNION = _compile_category(BEC_PATTERNS)
+_DIRECTIVE_UNION = _compile_category(DIRECTIVE_PATTERNS)
+
+# Authority claim categories in evidence order: (compiled category, evidence label)
+_CLAIM_CATEGORIES = (
+    (_TITLES_UNION, "Authority title detected"),
+    (_DEPARTMENTS_UNION, "Authority department detected"),
+    (_ORGANIZATIONS_UNION, "Authority organization detected"),
+)
+
+# Confidence buckets: no score, below 0.3, below 0.6, 0.6 and up
+_CONFIDENCE_THRESHOLDS = (NONZERO_SCORE, 0.3, 0.6)
+
+
+def _find_matches(text: str, category: Tuple[re.Pattern, Dict[int, Tuple[int, int]]]) -> List[str]:
+    """Find all matches for a union-compiled pattern category in lowercased text."""
+    pattern, alternatives = category
+    hits = []
+    for m in pattern.finditer(text):
+        index, group = alternatives[m.lastindex]
+        hits.append((index, m.start(), m.end(m.lastindex), m.group(group)))
+    # Report in pattern order, as when each pattern was searched separately,
+    # skipping hits that overlap an earlier hit of the same pattern
+    hits.sort()
 
-def _find_matches(text: str, patterns: List[str]) -> List[str]:
-    """Find all matches for a list of regex patterns in text."""
     matches = []
-    text_lower = text.lower()
-    for pattern in patterns:
-        found = re.findall(pattern, text_lower, re.IGNORECASE)
-        for match in found:
-            if isinstance(match, tuple):
-                match = match[0]
-            if match and match not in matches:
-                matches.append(match)
+    seen = set()
+    last_index, last_end = -1, 0
+    for index, start, end, match in hits:
+        if index == last_index and start < last_end:
+            continue
+        last_index, last_end = index, end
+        if match and match not in seen:
+            seen.add(match)
+            matches.append(match)
     return matches
 
 
-def analyze(text: str) -> SignalResult:
+@memoize_analyzer
+def analyze(text: str, text_lower: Optional[str] = None) -> SignalResult:
     """
     Analyze text for authority-based social engineering indicators.
+
+    text_lower may be passed in when the caller has already lowercased text.
     
     Two-phase detection:
     1. Detect authority claims (titles, departments, organizations)
@@ -89,35 +145,26 @@ def analyze(text: str) -> SignalResult:
     - Authority + directive language: higher score (0.5-0.7)
     """
     evidence = []
+    if text_lower is None:
+        text_lower = text.lower()
     
     # Phase 1: Detect authority claims
-    title_matches = _find_matches(text, AUTHORITY_TITLES)
-    department_matches = _find_matches(text, AUTHORITY_DEPARTMENTS)
-    organization_matches = _find_matches(text, AUTHORITY_ORGANIZATIONS)
-    bec_matches = _find_matches(text, BEC_PATTERNS)
-    
-    authority_found = False
-    
-    if title_matches:
-        authority_found = True
-        evidence.append(f"Authority title detected: {', '.join(title_matches)}")
-    
-    if department_matches:
-        authority_found = True
-        evidence.append(f"Authority department detected: {', '.join(department_matches)}")
-    
-    if organization_matches:
-        authority_found = True
-        evidence.append(f"Authority organization detected: {', '.join(organization_matches)}")
-    
+    claim_matches = [_find_matches(text_lower, category) for category, _ in _CLAIM_CATEGORIES]
+    bec_matches = _find_matches(text_lower, _BEC_UNION)
+
+    for matches, (_, label) in zip(claim_matches, _CLAIM_CATEGORIES):
+        if matches:
+            evidence.append(f"{label}: {', '.join(matches)}")
+    authority_category_count = sum(1 for matches in claim_matches if matches)
+
     # BEC pattern detection
     bec_found = len(bec_matches) > 0
     if bec_found:
-        authority_found = True  # BEC implies authority abuse
         evidence.append(f"BEC pattern detected: {', '.join(bec_matches[:2])}")
+    authority_found = authority_category_count > 0 or bec_found  # BEC implies authority abuse
     
     # Phase 2: Detect directive/compliance language
-    directive_matches = _find_matches(text, DIRECTIVE_PATTERNS)
+    directive_matches = _find_matches(text_lower, _DIRECTIVE_UNION)
     directive_found = len(directive_matches) > 0
     
     if directive_found:
@@ -131,11 +178,6 @@ def analyze(text: str) -> SignalResult:
         base_score = 0.5
         
         # Add 0.1 for each additional authority category (max 0.2 extra)
-        authority_category_count = sum([
-            1 if title_matches else 0,
-            1 if department_matches else 0,
-            1 if organization_matches else 0,
-        ])
         authority_bonus = min((authority_category_count - 1) * 0.1, 0.2)
         
         # Add 0.05 for each additional directive match (max 0.1 extra)
@@ -149,11 +191,6 @@ def analyze(text: str) -> SignalResult:
         base_score = 0.2
         
         # Add 0.05 for each additional authority category (max 0.1 extra)
-        authority_category_count = sum([
-            1 if title_matches else 0,
-            1 if department_matches else 0,
-            1 if organization_matches else 0,
-        ])
         authority_bonus = min((authority_category_count - 1) * 0.05, 0.1)
         
         score = base_score + authority_bonus
@@ -173,14 +210,7 @@ def analyze(text: str) -> SignalResult:
     score = min(score, 0.85)  # Cap score
     
     # Map score to confidence
-    if score == 0.0:
-        confidence = 0.5
-    elif score < 0.3:
-        confidence = 0.6
-    elif score < 0.6:
-        confidence = 0.75
-    else:
-        confidence = 0.9
+    confidence = score_confidence(score, _CONFIDENCE_THRESHOLDS)
     
     # Cap evidence to avoid UI clutter
     max_evidence_items = 5
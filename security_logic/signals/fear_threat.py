@@ -1,5 +1,5 @@
-import re
-from ..base import SignalResult
+from typing import Optional
+from ..base import NONZERO_SCORE, SignalResult, compile_union, memoize_analyzer, score_confidence
 
 # Benign patterns that indicate legitimate notifications
 BENIGN_FEAR_PATTERNS = [
@@ -10,7 +10,98 @@ BENIGN_FEAR_PATTERNS = [
     r'\bthank\s+you\s+for\s+(?:your\s+)?(?:order|purchase|booking|payment)\b',
 ]
 
-def analyze(text: str) -> SignalResult:
+ACCOUNT_THREATS = [
+    r"account\s+(?:has\s+been\s+)?(?:compromised|hacked|breached|suspended|frozen|locked)",
+    r"unauthorized\s+(?:access|activity|login|transaction)",
+    r"suspicious\s+(?:activity|login|access|transaction|sign[\s-]?in)",
+    r"security\s+(?:breach|alert|threat|issue|concern)",
+    r"(?:detected|noticed|found)\s+(?:unusual|suspicious|unauthorized)\s+(?:activity|access|login)",
+    r"your\s+(?:account|data|information)\s+(?:is|may\s+be)\s+(?:at\s+risk|compromised|in\s+danger)",
+    r"we\s+(?:detected|noticed|found)\s+(?:a\s+)?(?:problem|issue|concern)",
+    r"someone\s+(?:tried|attempted|is\s+trying)\s+to\s+(?:access|log\s*in|hack)",
+]
+
+LEGAL_THREATS = [
+    r"(?:legal|law\s+enforcement|police|court|lawsuit|prosecution)\s+(?:action|proceeding)",
+    r"(?:illegal|unlawful|violat(?:e|ion)\s+of\s+(?:law|terms|policy))",
+    r"criminal\s+(?:charges|liability|action|prosecution)",
+    r"(?:authorities|law\s+enforcement)\s+(?:will\s+be\s+)?(?:notified|contacted|involved)",
+    r"face\s+(?:legal|criminal|serious)\s+consequences",
+]
+
+ACCESS_THREATS = [
+    r"(?:account|service|access)\s+(?:will\s+be\s+)?(?:suspended|terminated|closed|disabled|revoked|frozen|locked)",
+    r"(?:suspend|terminate|close|disable|freeze|lock)\s+(?:your\s+)?(?:account|service|access)",
+    r"lose\s+(?:access|your\s+account|all\s+data)",
+    r"ban(?:ned)?\s+from\s+(?:the\s+)?(?:platform|service|system)",
+    r"(?:permanent(?:ly)?|immediate(?:ly)?)\s+(?:delete|remove|suspend|disable)",
+    r"no\s+longer\s+(?:have\s+)?access",
+]
+
+COMPLIANCE_THREATS = [
+    r"(?:failure|refusal)\s+to\s+(?:comply|respond|verify|confirm|act)",
+    r"fail(?:ure)?\s+to\s+\w+\s+will\s+result\s+in",
+    r"otherwise\s+(?:your|we\s+will)",
+    r"(?:if|unless)\s+(?:you\s+)?(?:don't|do\s+not|fail\s+to)",
+    r"(?:must|need\s+to)\s+(?:verify|confirm|update)\s+(?:immediately|now|within)",
+]
+
+DATA_THREATS = [
+    r"(?:data|files?|information|documents?)\s+(?:will\s+be\s+)?(?:deleted|lost|destroyed|encrypted)",
+    r"(?:ransom|encrypt(?:ed)?|locked)\s+(?:your\s+)?(?:files?|data|system)",
+    r"(?:recovery|restore)\s+(?:is\s+)?(?:not|no\s+longer)\s+possible",
+    r"permanent(?:ly)?\s+(?:lose|delete|remove)",
+]
+
+FINANCIAL_THREATS = [
+    r"(?:funds?|money|payment|charges?)\s+(?:will\s+be\s+)?(?:deducted|charged|withdrawn|lost)",
+    r"(?:fee|penalty|fine)\s+(?:will\s+be\s+)?(?:applied|charged|assessed)",
+    r"(?:fraudulent|unauthorized)\s+(?:transaction|charge|payment)",
+    r"(?:your\s+)?(?:bank|card|payment)\s+(?:has\s+been\s+)?(?:flagged|blocked|frozen)",
+]
+
+# Tech support scam patterns
+TECH_SUPPORT_THREATS = [
+    r"(?:computer|device|system|browser)\s+(?:is\s+)?(?:infected|compromised|hacked|sending\s+spam)",
+    r"(?:virus|malware|trojan|spyware)\s+(?:detected|found|infection)",
+    r"(?:call|contact)\s+(?:this|our)\s+(?:number|support|helpline)",
+    r"(?:download|install)\s+(?:this|our)\s+(?:fix|tool|software|patch)",
+    r"(?:your\s+)?ip\s+(?:address\s+)?(?:linked|associated|flagged)\s+(?:to|with|for)\s+(?:illegal|criminal|suspicious)",
+]
+
+# QR code specific threats
+QR_THREATS = [
+    r"(?:scan|use)\s+(?:this|the)\s+(?:qr|barcode|code)",
+    r"qr\s+(?:code\s+)?(?:required|needed|authentication|payment|verification)",
+    r"(?:payment|verification|authentication)\s+(?:via|through|using)\s+qr",
+]
+
+# Every pattern analyze() can match, for prefilters
+ALL_PATTERNS = (
+    BENIGN_FEAR_PATTERNS + ACCOUNT_THREATS + LEGAL_THREATS + ACCESS_THREATS + COMPLIANCE_THREATS
+    + DATA_THREATS + FINANCIAL_THREATS + TECH_SUPPORT_THREATS + QR_THREATS
+)
+
+# (pattern union, evidence message, score increment) per threat category
+_THREAT_CATEGORIES = [
+    (compile_union(ACCOUNT_THREATS), "Account compromise or security threat detected", 0.18),
+    (compile_union(LEGAL_THREATS), "Legal or enforcement threat detected", 0.18),
+    (compile_union(ACCESS_THREATS), "Threat of suspension or loss of access detected", 0.18),
+    (compile_union(COMPLIANCE_THREATS), "Threat of consequences for non-compliance detected", 0.12),
+    (compile_union(DATA_THREATS), "Threat to data or files detected", 0.15),
+    (compile_union(FINANCIAL_THREATS), "Financial threat or penalty detected", 0.15),
+    (compile_union(TECH_SUPPORT_THREATS), "Tech support scam threat detected", 0.2),
+    (compile_union(QR_THREATS), "QR-based threat detected", 0.2),
+]
+
+_BENIGN_UNION = compile_union(BENIGN_FEAR_PATTERNS)
+
+# Confidence buckets: no score, below 0.3, below 0.5, 0.5 and up
+_CONFIDENCE_THRESHOLDS = (NONZERO_SCORE, 0.3, 0.5)
+
+
+@memoize_analyzer
+def analyze(text: str, text_lower: Optional[str] = None) -> SignalResult:
     # Handle empty or non-string input
     if not isinstance(text, str) or not text.strip():
         return SignalResult(
@@ -20,94 +111,18 @@ def analyze(text: str) -> SignalResult:
             evidence=[]
         )
 
-    text_lower = text.lower()
+    if text_lower is None:
+        text_lower = text.lower()
     evidence = []
     score = 0.0
 
     # Check for benign context first
-    is_benign_context = any(re.search(p, text_lower) for p in BENIGN_FEAR_PATTERNS)
-
-    account_threats = [
-        r"account\s+(?:has\s+been\s+)?(?:compromised|hacked|breached|suspended|frozen|locked)",
-        r"unauthorized\s+(?:access|activity|login|transaction)",
-        r"suspicious\s+(?:activity|login|access|transaction|sign[\s-]?in)",
-        r"security\s+(?:breach|alert|threat|issue|concern)",
-        r"(?:detected|noticed|found)\s+(?:unusual|suspicious|unauthorized)\s+(?:activity|access|login)",
-        r"your\s+(?:account|data|information)\s+(?:is|may\s+be)\s+(?:at\s+risk|compromised|in\s+danger)",
-        r"we\s+(?:detected|noticed|found)\s+(?:a\s+)?(?:problem|issue|concern)",
-        r"someone\s+(?:tried|attempted|is\s+trying)\s+to\s+(?:access|log\s*in|hack)",
-    ]
-
-    legal_threats = [
-        r"(?:legal|law\s+enforcement|police|court|lawsuit|prosecution)\s+(?:action|proceeding)",
-        r"(?:illegal|unlawful|violat(?:e|ion)\s+of\s+(?:law|terms|policy))",
-        r"criminal\s+(?:charges|liability|action|prosecution)",
-        r"(?:authorities|law\s+enforcement)\s+(?:will\s+be\s+)?(?:notified|contacted|involved)",
-        r"face\s+(?:legal|criminal|serious)\s+consequences",
-    ]
-
-    access_threats = [
-        r"(?:account|service|access)\s+(?:will\s+be\s+)?(?:suspended|terminated|closed|disabled|revoked|frozen|locked)",
-        r"(?:suspend|terminate|close|disable|freeze|lock)\s+(?:your\s+)?(?:account|service|access)",
-        r"lose\s+(?:access|your\s+account|all\s+data)",
-        r"ban(?:ned)?\s+from\s+(?:the\s+)?(?:platform|service|system)",
-        r"(?:permanent(?:ly)?|immediate(?:ly)?)\s+(?:delete|remove|suspend|disable)",
-        r"no\s+longer\s+(?:have\s+)?access",
-    ]
-
-    compliance_threats = [
-        r"(?:failure|refusal)\s+to\s+(?:comply|respond|verify|confirm|act)",
-        r"fail(?:ure)?\s+to\s+\w+\s+will\s+result\s+in",
-        r"otherwise\s+(?:your|we\s+will)",
-        r"(?:if|unless)\s+(?:you\s+)?(?:don't|do\s+not|fail\s+to)",
-        r"(?:must|need\s+to)\s+(?:verify|confirm|update)\s+(?:immediately|now|within)",
-    ]
-
-    data_threats = [
-        r"(?:data|files?|information|documents?)\s+(?:will\s+be\s+)?(?:deleted|lost|destroyed|encrypted)",
-        r"(?:ransom|encrypt(?:ed)?|locked)\s+(?:your\s+)?(?:files?|data|system)",
-        r"(?:recovery|restore)\s+(?:is\s+)?(?:not|no\s+longer)\s+possible",
-        r"permanent(?:ly)?\s+(?:lose|delete|remove)",
-    ]
-
-    financial_threats = [
-        r"(?:funds?|money|payment|charges?)\s+(?:will\s+be\s+)?(?:deducted|charged|withdrawn|lost)",
-        r"(?:fee|penalty|fine)\s+(?:will\s+be\s+)?(?:applied|charged|assessed)",
-        r"(?:fraudulent|unauthorized)\s+(?:transaction|charge|payment)",
-        r"(?:your\s+)?(?:bank|card|payment)\s+(?:has\s+been\s+)?(?:flagged|blocked|frozen)",
-    ]
-
-    # Tech support scam patterns
-    tech_support_threats = [
-        r"(?:computer|device|system|browser)\s+(?:is\s+)?(?:infected|compromised|hacked|sending\s+spam)",
-        r"(?:virus|malware|trojan|spyware)\s+(?:detected|found|infection)",
-        r"(?:call|contact)\s+(?:this|our)\s+(?:number|support|helpline)",
-        r"(?:download|install)\s+(?:this|our)\s+(?:fix|tool|software|patch)",
-        r"(?:your\s+)?ip\s+(?:address\s+)?(?:linked|associated|flagged)\s+(?:to|with|for)\s+(?:illegal|criminal|suspicious)",
-    ]
-
-    # QR code specific threats
-    qr_threats = [
-        r"(?:scan|use)\s+(?:this|the)\s+(?:qr|barcode|code)",
-        r"qr\s+(?:code\s+)?(?:required|needed|authentication|payment|verification)",
-        r"(?:payment|verification|authentication)\s+(?:via|through|using)\s+qr",
-    ]
-
-    for patterns, message, increment in [
-        (account_threats, "Account compromise or security threat detected", 0.18),
-        (legal_threats, "Legal or enforcement threat detected", 0.18),
-        (access_threats, "Threat of suspension or loss of access detected", 0.18),
-        (compliance_threats, "Threat of consequences for non-compliance detected", 0.12),
-        (data_threats, "Threat to data or files detected", 0.15),
-        (financial_threats, "Financial threat or penalty detected", 0.15),
-        (tech_support_threats, "Tech support scam threat detected", 0.2),
-        (qr_threats, "QR-based threat detected", 0.2),
-    ]:
-        for pattern in patterns:
-            if re.search(pattern, text_lower):
-                evidence.append(message)
-                score += increment
-                break
+    is_benign_context = _BENIGN_UNION.search(text_lower) is not None
+
+    for pattern, message, increment in _THREAT_CATEGORIES:
+        if pattern.search(text_lower):
+            evidence.append(message)
+            score += increment
 
     # Boost score if multiple threat types detected
     if len(evidence) >= 3:
@@ -120,15 +135,7 @@ def analyze(text: str) -> SignalResult:
         evidence.append("Benign notification context detected - score suppressed")
 
     score = min(score, 0.85)
-
-    if score == 0.0:
-        confidence = 0.5
-    elif score < 0.3:
-        confidence = 0.6
-    elif score < 0.5:
-        confidence = 0.75
-    else:
-        confidence = 0.9
+    confidence = score_confidence(score, _CONFIDENCE_THRESHOLDS)
 
     return SignalResult(
         signal_name="fear_threat",
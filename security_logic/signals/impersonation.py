@@ -1,6 +1,6 @@
 import re
-from typing import List
-from ..base import SignalResult
+from typing import List, Optional
+from ..base import NONZERO_SCORE, GapPattern, SignalResult, compile_union, memoize_analyzer, score_confidence
 
 # Known company/service names commonly impersonated
 KNOWN_COMPANIES = [
@@ -24,8 +24,79 @@ OFFICIAL_ENTITIES = [
     r'(?:tax|revenue)\s+(?:agency|authority|department)',
 ]
 
+# Direct identity assertion ("I am", "this is", "I'm from")
+IDENTITY_PATTERNS = [
+    r'\bi\s+am\s+(?:a\s+)?(?:your\s+)?(\w+\s+)?(?:manager|admin|support|agent|representative|officer|staff|technician)',
+    r'\bthis\s+is\s+(\w+\s+)?(?:from|with)\s+(?:the\s+)?(\w+)',
+    r'\bi\s+(?:work\s+)?(?:for|with|am\s+from)\s+(?:the\s+)?(\w+)',
+    r'\bcalling\s+(?:from|on\s+behalf\s+of)',
+    r'\bcontacting\s+you\s+(?:from|regarding)',
+]
+
+# Known company mentioned in an impersonation context
+COMPANY_PATTERN = r'\b(?:' + '|'.join(KNOWN_COMPANIES) + r')\b'
+COMPANY_CONTEXT_PATTERNS = [
+    COMPANY_PATTERN + r'\s+(?:support|security|team|account|service|customer\s+service)',
+    r'(?:from|with|at)\s+' + COMPANY_PATTERN,
+    COMPANY_PATTERN + r'\s+(?:has|detected|noticed|found)',
+    r'(?:your\s+)?' + COMPANY_PATTERN + r'\s+account',
+]
+
+# Role/position claims ("I'm your", "acting as", "behalf of")
+ROLE_PATTERNS = [
+    r'\b(?:your|the)\s+(?:manager|supervisor|admin|support|representative|it\s+staff|technician)',
+    r'\b(?:acting\s+)?as\s+(?:your\s+)?(?:manager|admin|support|agent|representative)',
+    r'\bon\s+behalf\s+of\s+(?:the\s+)?(\w+)',
+    r'\bauthorized\s+(?:by|representative|agent)',
+]
+
+# Tech support scam patterns
+TECH_SUPPORT_PATTERNS = [
+    r'(?:your\s+)?(?:computer|device|system)\s+(?:has\s+been\s+)?(?:infected|hacked|compromised)',
+    r'(?:virus|malware|threat)\s+(?:detected|found|alert)',
+    r'call\s+(?:this\s+number|us|immediately)\s+(?:to|for)\s+(?:fix|resolve|help)',
+    r'(?:tech|technical)\s+support\s+(?:team|specialist|expert)',
+    r'remote\s+(?:access|connection|session)',
+]
+
+# Delivery/shipping impersonation
+DELIVERY_PATTERNS = [
+    r'(?:package|parcel|shipment|delivery)\s+(?:could\s+not\s+be|failed|pending|waiting)',
+    r'(?:reschedule|confirm)\s+(?:your\s+)?(?:delivery|shipment)',
+    r'(?:tracking|reference)\s+(?:number|id)[\s:]+[\w\-]+',
+    r'(?:customs|import)\s+(?:fee|duty|charge)',
+]
 
-def analyze(text: str) -> SignalResult:
+# Brand + action request combinations (high confidence scam indicators)
+BRAND_ACTION_PATTERNS = [
+    GapPattern(COMPANY_PATTERN, r'\b(?:verify|confirm|update)\s+(?:your\s+)?(?:account|identity|details|information)\b'),
+    GapPattern(COMPANY_PATTERN, r'\b(?:click|log\s*in|sign\s*in)\b', r'\b(?:here|now|immediately)\b'),
+    r'\bthis\s+is\s+(?:' + '|'.join(KNOWN_COMPANIES) + r')\b',
+    r'\b(?:from|at)\s*:\s*(?:' + '|'.join(KNOWN_COMPANIES) + r')\s+(?:support|security|team)\b',
+]
+
+# Every pattern analyze() can match, for prefilters
+ALL_PATTERNS = (
+    IDENTITY_PATTERNS + [COMPANY_PATTERN] + COMPANY_CONTEXT_PATTERNS + OFFICIAL_ENTITIES
+    + ROLE_PATTERNS + TECH_SUPPORT_PATTERNS + DELIVERY_PATTERNS + BRAND_ACTION_PATTERNS
+)
+
+# One union per cue category, compiled once at import and searched on
+# lowercased text (faster than re.IGNORECASE on the original)
+_IDENTITY_UNION = compile_union(IDENTITY_PATTERNS)
+_COMPANY_RE = re.compile(COMPANY_PATTERN)
+_COMPANY_CONTEXT_UNION = compile_union(COMPANY_CONTEXT_PATTERNS)
+_OFFICIAL_UNION = compile_union(OFFICIAL_ENTITIES)
+_ROLE_UNION = compile_union(ROLE_PATTERNS)
+_TECH_SUPPORT_UNION = compile_union(TECH_SUPPORT_PATTERNS)
+_DELIVERY_UNION = compile_union(DELIVERY_PATTERNS)
+_BRAND_ACTION_UNION = compile_union(BRAND_ACTION_PATTERNS)
+
+# Confidence buckets: no score, below 0.3, below 0.5, 0.5 and up
+_CONFIDENCE_THRESHOLDS = (NONZERO_SCORE, 0.3, 0.5)
+
+@memoize_analyzer
+def analyze(text: str, text_lower: Optional[str] = None) -> SignalResult:
     """
     Detect identity impersonation claims in text.
 
@@ -37,6 +108,7 @@ def analyze(text: str) -> SignalResult:
 
     Args:
         text: The input text to analyze
+        text_lower: text.lower(), if the caller has already computed it
 
     Returns:
         SignalResult with impersonation detection findings
@@ -44,106 +116,49 @@ def analyze(text: str) -> SignalResult:
     if not text or not isinstance(text, str):
         return SignalResult(signal_name="impersonation", score=0.0, confidence=0.5, evidence=[])
 
-    text_lower = text.lower()
+    if text_lower is None:
+        text_lower = text.lower()
     evidence: List[str] = []
     score = 0.0
 
     # Pattern 1: Direct identity assertion ("I am", "this is", "I'm from")
-    identity_patterns = [
-        r'\bi\s+am\s+(?:a\s+)?(?:your\s+)?(\w+\s+)?(?:manager|admin|support|agent|representative|officer|staff|technician)',
-        r'\bthis\s+is\s+(\w+\s+)?(?:from|with)\s+(?:the\s+)?(\w+)',
-        r'\bi\s+(?:work\s+)?(?:for|with|am\s+from)\s+(?:the\s+)?(\w+)',
-        r'\bcalling\s+(?:from|on\s+behalf\s+of)',
-        r'\bcontacting\s+you\s+(?:from|regarding)',
-    ]
-
-    for pattern in identity_patterns:
-        if re.search(pattern, text_lower):
-            evidence.append("Direct identity assertion detected")
-            score += 0.2
-            break
+    if _IDENTITY_UNION.search(text_lower):
+        evidence.append("Direct identity assertion detected")
+        score += 0.2
+
+    # Every company context and brand + action pattern names a known
+    # company, so one scan for a company name gates patterns 2 and 7
+    company_match = _COMPANY_RE.search(text_lower)
 
     # Pattern 2: Known company impersonation
-    company_pattern = r'\b(?:' + '|'.join(KNOWN_COMPANIES) + r')\b'
-    company_context_patterns = [
-        company_pattern + r'\s+(?:support|security|team|account|service|customer\s+service)',
-        r'(?:from|with|at)\s+' + company_pattern,
-        company_pattern + r'\s+(?:has|detected|noticed|found)',
-        r'(?:your\s+)?' + company_pattern + r'\s+account',
-    ]
-
-    for pattern in company_context_patterns:
-        if re.search(pattern, text_lower):
-            # Find which company was mentioned
-            company_match = re.search(company_pattern, text_lower)
-            if company_match:
-                evidence.append(f"Known company impersonation: {company_match.group()}")
-                score += 0.25
-                break
+    if company_match and _COMPANY_CONTEXT_UNION.search(text_lower):
+        evidence.append(f"Known company impersonation: {company_match.group()}")
+        score += 0.25
 
     # Pattern 3: Official/government entity impersonation
-    for pattern in OFFICIAL_ENTITIES:
-        if re.search(pattern, text_lower):
-            evidence.append("Government or official entity impersonation detected")
-            score += 0.3
-            break
+    if _OFFICIAL_UNION.search(text_lower):
+        evidence.append("Government or official entity impersonation detected")
+        score += 0.3
 
     # Pattern 4: Role/position claims ("I'm your", "acting as", "behalf of")
-    role_patterns = [
-        r'\b(?:your|the)\s+(?:manager|supervisor|admin|support|representative|it\s+staff|technician)',
-        r'\b(?:acting\s+)?as\s+(?:your\s+)?(?:manager|admin|support|agent|representative)',
-        r'\bon\s+behalf\s+of\s+(?:the\s+)?(\w+)',
-        r'\bauthorized\s+(?:by|representative|agent)',
-    ]
-
-    for pattern in role_patterns:
-        if re.search(pattern, text_lower):
-            evidence.append("Role or position impersonation claim detected")
-            score += 0.15
-            break
+    if _ROLE_UNION.search(text_lower):
+        evidence.append("Role or position impersonation claim detected")
+        score += 0.15
 
     # Pattern 5: Tech support scam patterns
-    tech_support_patterns = [
-        r'(?:your\s+)?(?:computer|device|system)\s+(?:has\s+been\s+)?(?:infected|hacked|compromised)',
-        r'(?:virus|malware|threat)\s+(?:detected|found|alert)',
-        r'call\s+(?:this\s+number|us|immediately)\s+(?:to|for)\s+(?:fix|resolve|help)',
-        r'(?:tech|technical)\s+support\s+(?:team|specialist|expert)',
-        r'remote\s+(?:access|connection|session)',
-    ]
-
-    for pattern in tech_support_patterns:
-        if re.search(pattern, text_lower):
-            evidence.append("Tech support scam pattern detected")
-            score += 0.2
-            break
+    if _TECH_SUPPORT_UNION.search(text_lower):
+        evidence.append("Tech support scam pattern detected")
+        score += 0.2
 
     # Pattern 6: Delivery/shipping impersonation
-    delivery_patterns = [
-        r'(?:package|parcel|shipment|delivery)\s+(?:could\s+not\s+be|failed|pending|waiting)',
-        r'(?:reschedule|confirm)\s+(?:your\s+)?(?:delivery|shipment)',
-        r'(?:tracking|reference)\s+(?:number|id)[\s:]+[\w\-]+',
-        r'(?:customs|import)\s+(?:fee|duty|charge)',
-    ]
-
-    for pattern in delivery_patterns:
-        if re.search(pattern, text_lower):
-            evidence.append("Delivery service impersonation pattern detected")
-            score += 0.15
-            break
+    if _DELIVERY_UNION.search(text_lower):
+        evidence.append("Delivery service impersonation pattern detected")
+        score += 0.15
 
     # Pattern 7: Brand + action request combinations (high confidence scam indicators)
-    brand_action_patterns = [
-        r'\b(?:' + '|'.join(KNOWN_COMPANIES) + r')\b.*\b(?:verify|confirm|update)\s+(?:your\s+)?(?:account|identity|details|information)\b',
-        r'\b(?:' + '|'.join(KNOWN_COMPANIES) + r')\b.*\b(?:click|log\s*in|sign\s*in)\b.*\b(?:here|now|immediately)\b',
-        r'\bthis\s+is\s+(?:' + '|'.join(KNOWN_COMPANIES) + r')\b',
-        r'\b(?:from|at)\s*:\s*(?:' + '|'.join(KNOWN_COMPANIES) + r')\s+(?:support|security|team)\b',
-    ]
-    
-    for pattern in brand_action_patterns:
-        if re.search(pattern, text_lower):
-            evidence.append("Brand impersonation with action request detected")
-            score += 0.25
-            break
+    if company_match and _BRAND_ACTION_UNION.search(text_lower):
+        evidence.append("Brand impersonation with action request detected")
+        score += 0.25
 
     # Boost score if multiple impersonation types detected
     if len(evidence) >= 3:
@@ -153,14 +168,7 @@ def analyze(text: str) -> SignalResult:
     score = min(score, 0.85)
 
     # Bucketed confidence logic based on score
-    if score == 0.0:
-        confidence = 0.5
-    elif score < 0.3:
-        confidence = 0.6
-    elif score < 0.5:
-        confidence = 0.75
-    else:
-        confidence = 0.9
+    confidence = score_confidence(score, _CONFIDENCE_THRESHOLDS)
 
     return SignalResult(
         signal_name="impersonation",
@@ -1,5 +1,6 @@
 import re
-from ..base import SignalResult
+from typing import Optional
+from ..base import NONZERO_SCORE, GapPattern, SignalResult, compile_union, memoize_analyzer, score_confidence
 
 # Benign context patterns - suppress false positives
 BENIGN_CONTEXT_PATTERNS = [
@@ -17,7 +18,115 @@ BENIGN_CONTEXT_PATTERNS = [
     r'\bwebinar\b',  # Educational webinars
 ]
 
-def analyze(text: str) -> SignalResult:
+# Category 1: Reward/prize language (+0.2)
+REWARD_PATTERNS = [
+    r'\bprizes?\b',
+    r'\bwinnings?\b',
+    r'\bbonuses?\b',
+    r'\bgift\s+cards?\b',
+    r'\bexclusive\s+offers?\b',
+    r'\bspecial\s+selection\b',
+    r'\bfree\b',
+    r'\bdiscounted\b',
+    r'\bbenefits?\b',
+    r'\brewards?\b',
+]
+
+# Category 2: Monetary/financial language (+0.2)
+MONETARY_PATTERNS = [
+    r'\$\d+',
+    r'\bcompensation\b',
+    r'\bpayout\b',
+    r'\bsettlement\b',
+    r'\brefund\b',
+    r'\breimbursement\b',
+    r'\bpayment\b',
+    r'\bcash\s+bonus\b',
+    r'\bmonetary\b',
+    r'\bfunds\b',
+]
+
+# Category 3: Claim/action language (+0.15)
+CLAIM_PATTERNS = [
+    r'\bclaim\b',
+    r'\breceive\s+(?:your\s+)?(?:payment|reward|prize)\b',
+    r'\bcredited\s+to\s+your\s+account\b',
+    r'\bfunds\s+will\s+be\s+credited\b',
+    r'\beligible\s+for\s+(?:payment|reward)\b',
+    r'\bcollect\s+(?:your\s+)?(?:reward|prize|winnings)\b',
+    r'\bredeem\b',
+]
+
+# Category 4: Scam-specific patterns (+0.25) - investment/work-from-home scams
+SCAM_PATTERNS = [
+    r'\bguaranteed\s+(?:\d+%?\s+)?returns?\b',  # "Guaranteed 500% returns"
+    r'\b(?:earn|make)\s+\$?\d+[,\d]*(?:k|K)?\s*/?\s*(?:week|month|day)\b',  # "Earn $5000/week"
+    GapPattern(r'\bwork(?:ing)?\s+from\s+home\b', r'\bno\s+experience\b'),  # Work from home scams
+    r'\bno\s+experience\s+(?:needed|required)\b',
+    r'\bsecret\s+(?:strategy|method|system)\b',  # "Secret Bitcoin strategy"
+    r'\b(?:bitcoin|crypto)\s+(?:investment|strategy|opportunity)\b',
+    r'\bmade\s+(?:me\s+)?\$?\d+[,\d]*(?:k|K)?\b',  # "Made me $100,000"
+    r'\bgovernment\s+(?:stimulus|grant|payment)\b',  # Fake government payments
+    r'\bpre[\s-]?approved\s+(?:for\s+)?(?:a\s+)?\$?\d+',  # "Pre-approved for $50,000"
+    r'\bbad\s+credit\s+(?:ok|okay|accepted)\b',  # Loan scam indicators
+    r'\b(?:lottery|sweepstakes)\s+(?:winner|winning)\b',
+    r'\brandomly\s+selected\b',
+    r'\b(?:nigerian|foreign)\s+prince\b',
+    r'\btransfer(?:ring)?\s+\$?\d+[,\d]*\s*(?:million|m)\b',  # Money transfer scams
+    r'\b(?:you\'?ll|you\s+will)\s+receive\s+\d+%\b',  # "You'll receive 30%"
+]
+
+# Category 5: NFT/Crypto scam patterns (+0.3)
+CRYPTO_NFT_PATTERNS = [
+    r'\bnft\s+(?:mint(?:ing)?|drop|airdrop|collection)\b',
+    r'\bconnect\s+(?:your\s+)?wallet\b',
+    r'\bwallet\s+(?:verification|authentication|connection)\b',
+    r'\bapprove\s+(?:the\s+)?transaction\b',
+    r'\b(?:free|exclusive)\s+(?:nft|token|airdrop)\b',
+    r'\bwhitelist\s+(?:spot|access)\b',
+    r'\b(?:limited|rare)\s+(?:nft|token|mint)\b',
+]
+
+# Category 5: Too-good-to-be-true indicators (+0.2)
+TGTBT_PATTERNS = [
+    r'\b(?:100|200|300|400|500|1000)\s*%\s+(?:returns?|profit|roi)\b',
+    r'\b\$\d{4,}\s+(?:per|a|every)\s+(?:day|week)\b',  # High daily/weekly amounts
+    r'\bfree\s+(?:iphone|ipad|macbook|laptop|vacation|trip)\b',
+    r'\b(?:million|m)\s+(?:dollar|usd|\$)\b',
+    r'\bno\s+(?:risk|obligation|catch)\b',
+]
+
+# Every pattern analyze() can match, for prefilters
+ALL_PATTERNS = (
+    BENIGN_CONTEXT_PATTERNS + REWARD_PATTERNS + MONETARY_PATTERNS + CLAIM_PATTERNS
+    + SCAM_PATTERNS + CRYPTO_NFT_PATTERNS + TGTBT_PATTERNS
+)
+
+# Signal categories in scoring order, with their score increment and evidence
+_CATEGORIES = (
+    (REWARD_PATTERNS, 0.2, "Reward or prize-based language detected"),
+    (MONETARY_PATTERNS, 0.2, "Financial/monetary language detected"),
+    (CLAIM_PATTERNS, 0.15, "Claim or redemption language detected"),
+    (SCAM_PATTERNS, 0.3, "Scam-specific pattern detected (investment/work-from-home)"),
+    (CRYPTO_NFT_PATTERNS, 0.35, "NFT/Crypto scam pattern detected (wallet/mint)"),
+    (TGTBT_PATTERNS, 0.25, "Too-good-to-be-true indicator detected"),
+)
+_SCAM, _TGTBT = 3, 5
+
+# Compiled once at import, one union per category. Benign context is
+# matched on lowercased text. For ASCII text, matching text.lower() is
+# equivalent to re.IGNORECASE and faster; other text keeps re.IGNORECASE,
+# which also folds look-alikes such as "ı"/"i".
+_BENIGN_CONTEXT_UNION = compile_union(BENIGN_CONTEXT_PATTERNS)
+_LOWER_UNIONS = tuple(compile_union(patterns) for patterns, _, _ in _CATEGORIES)
+_CASELESS_UNIONS = tuple(compile_union(patterns, re.IGNORECASE) for patterns, _, _ in _CATEGORIES)
+
+# Confidence buckets: no score, below 0.3, below 0.6, 0.6 and up
+_CONFIDENCE_THRESHOLDS = (NONZERO_SCORE, 0.3, 0.6)
+
+
+@memoize_analyzer
+def analyze(text: str, text_lower: Optional[str] = None) -> SignalResult:
     # Handle empty or non-string input
     if not isinstance(text, str) or not text.strip():
         return SignalResult(
@@ -27,127 +136,26 @@ def analyze(text: str) -> SignalResult:
             evidence=[]
         )
 
-    text_lower = text.lower()
+    if text_lower is None:
+        text_lower = text.lower()
 
     # Check for benign context first
-    is_benign_context = any(re.search(p, text_lower) for p in BENIGN_CONTEXT_PATTERNS)
-
-    # Category 1: Reward/prize language (+0.2)
-    reward_patterns = [
-        r'\bprizes?\b',
-        r'\bwinnings?\b',
-        r'\bbonuses?\b',
-        r'\bgift\s+cards?\b',
-        r'\bexclusive\s+offers?\b',
-        r'\bspecial\s+selection\b',
-        r'\bfree\b',
-        r'\bdiscounted\b',
-        r'\bbenefits?\b',
-        r'\brewards?\b',
-    ]
-
-    # Category 2: Monetary/financial language (+0.2)
-    monetary_patterns = [
-        r'\$\d+',
-        r'\bcompensation\b',
-        r'\bpayout\b',
-        r'\bsettlement\b',
-        r'\brefund\b',
-        r'\breimbursement\b',
-        r'\bpayment\b',
-        r'\bcash\s+bonus\b',
-        r'\bmonetary\b',
-        r'\bfunds\b',
-    ]
-
-    # Category 3: Claim/action language (+0.15)
-    claim_patterns = [
-        r'\bclaim\b',
-        r'\breceive\s+(?:your\s+)?(?:payment|reward|prize)\b',
-        r'\bcredited\s+to\s+your\s+account\b',
-        r'\bfunds\s+will\s+be\s+credited\b',
-        r'\beligible\s+for\s+(?:payment|reward)\b',
-        r'\bcollect\s+(?:your\s+)?(?:reward|prize|winnings)\b',
-        r'\bredeem\b',
-    ]
-
-    # Category 4: Scam-specific patterns (+0.25) - investment/work-from-home scams
-    scam_patterns = [
-        r'\bguaranteed\s+(?:\d+%?\s+)?returns?\b',  # "Guaranteed 500% returns"
-        r'\b(?:earn|make)\s+\$?\d+[,\d]*(?:k|K)?\s*/?\s*(?:week|month|day)\b',  # "Earn $5000/week"
-        r'\bwork(?:ing)?\s+from\s+home\b.*\bno\s+experience\b',  # Work from home scams
-        r'\bno\s+experience\s+(?:needed|required)\b',
-        r'\bsecret\s+(?:strategy|method|system)\b',  # "Secret Bitcoin strategy"
-        r'\b(?:bitcoin|crypto)\s+(?:investment|strategy|opportunity)\b',
-        r'\bmade\s+(?:me\s+)?\$?\d+[,\d]*(?:k|K)?\b',  # "Made me $100,000"
-        r'\bgovernment\s+(?:stimulus|grant|payment)\b',  # Fake government payments
-        r'\bpre[\s-]?approved\s+(?:for\s+)?(?:a\s+)?\$?\d+',  # "Pre-approved for $50,000"
-        r'\bbad\s+credit\s+(?:ok|okay|accepted)\b',  # Loan scam indicators
-        r'\b(?:lottery|sweepstakes)\s+(?:winner|winning)\b',
-        r'\brandomly\s+selected\b',
-        r'\b(?:nigerian|foreign)\s+prince\b',
-        r'\btransfer(?:ring)?\s+\$?\d+[,\d]*\s*(?:million|m)\b',  # Money transfer scams
-        r'\b(?:you\'?ll|you\s+will)\s+receive\s+\d+%\b',  # "You'll receive 30%"
-    ]
-
-    # Category 5: NFT/Crypto scam patterns (+0.3)
-    crypto_nft_patterns = [
-        r'\bnft\s+(?:mint(?:ing)?|drop|airdrop|collection)\b',
-        r'\bconnect\s+(?:your\s+)?wallet\b',
-        r'\bwallet\s+(?:verification|authentication|connection)\b',
-        r'\bapprove\s+(?:the\s+)?transaction\b',
-        r'\b(?:free|exclusive)\s+(?:nft|token|airdrop)\b',
-        r'\bwhitelist\s+(?:spot|access)\b',
-        r'\b(?:limited|rare)\s+(?:nft|token|mint)\b',
-    ]
-
-    # Category 5: Too-good-to-be-true indicators (+0.2)
-    tgtbt_patterns = [
-        r'\b(?:100|200|300|400|500|1000)\s*%\s+(?:returns?|profit|roi)\b',
-        r'\b\$\d{4,}\s+(?:per|a|every)\s+(?:day|week)\b',  # High daily/weekly amounts
-        r'\bfree\s+(?:iphone|ipad|macbook|laptop|vacation|trip)\b',
-        r'\b(?:million|m)\s+(?:dollar|usd|\$)\b',
-        r'\bno\s+(?:risk|obligation|catch)\b',
-    ]
+    is_benign_context = _BENIGN_CONTEXT_UNION.search(text_lower) is not None
 
     evidence = []
     score = 0.0
 
-    # Check reward patterns
-    reward_match = any(re.search(p, text, re.IGNORECASE) for p in reward_patterns)
-    if reward_match:
-        score += 0.2
-        evidence.append("Reward or prize-based language detected")
-
-    # Check monetary patterns
-    monetary_match = any(re.search(p, text, re.IGNORECASE) for p in monetary_patterns)
-    if monetary_match:
-        score += 0.2
-        evidence.append("Financial/monetary language detected")
-
-    # Check claim patterns
-    claim_match = any(re.search(p, text, re.IGNORECASE) for p in claim_patterns)
-    if claim_match:
-        score += 0.15
-        evidence.append("Claim or redemption language detected")
-
-    # Check scam-specific patterns (high weight)
-    scam_match = any(re.search(p, text, re.IGNORECASE) for p in scam_patterns)
-    if scam_match:
-        score += 0.3
-        evidence.append("Scam-specific pattern detected (investment/work-from-home)")
-
-    # Check NFT/crypto patterns
-    crypto_nft_match = any(re.search(p, text, re.IGNORECASE) for p in crypto_nft_patterns)
-    if crypto_nft_match:
-        score += 0.35
-        evidence.append("NFT/Crypto scam pattern detected (wallet/mint)")
-
-    # Check too-good-to-be-true patterns
-    tgtbt_match = any(re.search(p, text, re.IGNORECASE) for p in tgtbt_patterns)
-    if tgtbt_match:
-        score += 0.25
-        evidence.append("Too-good-to-be-true indicator detected")
+    if text.isascii():
+        subject, unions = text_lower, _LOWER_UNIONS
+    else:
+        subject, unions = text, _CASELESS_UNIONS
+
+    matched = [union.search(subject) is not None for union in unions]
+    for hit, (_, increment, message) in zip(matched, _CATEGORIES):
+        if hit:
+            score += increment
+            evidence.append(message)
+    scam_match, tgtbt_match = matched[_SCAM], matched[_TGTBT]
 
     # Suppress score if benign context detected and no scam patterns
     if is_benign_context and not scam_match and not tgtbt_match:
@@ -157,15 +165,7 @@ def analyze(text: str) -> SignalResult:
 
     # Cap score at 0.85
     score = min(score, 0.85)
-
-    if score == 0.0:
-        confidence = 0.5
-    elif score < 0.3:
-        confidence = 0.6
-    elif score < 0.6:
-        confidence = 0.75
-    else:
-        confidence = 0.9
+    confidence = score_confidence(score, _CONFIDENCE_THRESHOLDS)
 
     return SignalResult(
         signal_name="reward_lure",
@@ -1,6 +1,7 @@
 import re
-from typing import List, Tuple
-from ..base import SignalResult
+from typing import List, Optional, Tuple
+from ..base import GapPattern, SignalResult, compile_each, compile_union, memoize_analyzer, score_confidence
+from ..prefilter import literal_gate
 
 # Benign context patterns - suppress false positives on confirmations
 BENIGN_URGENCY_PATTERNS = [
@@ -47,7 +48,7 @@ IMMEDIACY_PATTERNS = [
 TIME_PRESSURE_PATTERNS = [
     r'\b(?:limited[\s-]?time)\s+(?:offer|only|deal)\b',
     r'\bwhile\s+(?:supplies|stocks?|seats?|spots?)\s+last\b',
-    r'\b(?:hurry|quick|rush)\b.*\b(?:before|limited|running\s+out)\b',
+    GapPattern(r'\b(?:hurry|quick|rush)\b', r'\b(?:before|limited|running\s+out)\b'),
     r'\b(?:only|just)\s+\d+\s*(?:left|remaining|available)\b',
     r'\bbefore\s+(?:it\'?s?\s+)?too\s+late\b',
     r'\b(?:miss|lose)\s+(?:out|this|your)\b',
@@ -80,49 +81,172 @@ URGENCY_KEYWORDS_IN_CONTEXT = [
     r'\bimmediate\s+action\b',
 ]
 
+# Urgency words followed by exclamation marks, and runs of exclamation marks
+URGENT_EXCLAIM_PATTERN = r'\b(?:urgent|now|hurry|quick|fast|immediately|asap|warning|alert|important)[!]{1,3}'
+MULTI_EXCLAIM_PATTERN = r'[!]{2,}'
 
-def _find_matches(text: str, patterns: List[str]) -> List[str]:
-    """Find all matches for a list of patterns in the text."""
+# Urgency words in ALL CAPS (matched case-sensitively)
+CAPS_URGENCY_PATTERN = r'\b(URGENT|NOW|IMMEDIATELY|ASAP|WARNING|ALERT|CRITICAL|EMERGENCY|ACT NOW|HURRY|LIMITED TIME)\b'
+
+# Every pattern analyze() can match, for prefilters
+ALL_PATTERNS = (
+    BENIGN_URGENCY_PATTERNS + DEADLINE_PATTERNS + IMMEDIACY_PATTERNS + TIME_PRESSURE_PATTERNS
+    + ACTION_REQUEST_PATTERNS + URGENCY_KEYWORDS_IN_CONTEXT
+    + [URGENT_EXCLAIM_PATTERN, MULTI_EXCLAIM_PATTERN, CAPS_URGENCY_PATTERN]
+)
+
+def _compile_category(patterns: List[str]) -> Tuple[re.Pattern, Tuple[re.Pattern, ...]]:
+    """Compile a category as (case-insensitive union, per-pattern regexes)."""
+    return compile_union(patterns, re.IGNORECASE), compile_each(patterns, re.IGNORECASE)
+
+
+# Compiled once at import. Categories match case-insensitively on the
+# original text, benign context on lowercased text, CAPS case-sensitively.
+_BENIGN_RES = compile_each(BENIGN_URGENCY_PATTERNS)
+_DEADLINE = _compile_category(DEADLINE_PATTERNS)
+_IMMEDIACY = _compile_category(IMMEDIACY_PATTERNS)
+_TIME_PRESSURE = _compile_category(TIME_PRESSURE_PATTERNS)
+_ACTION_REQUEST = _compile_category(ACTION_REQUEST_PATTERNS)
+_KEYWORDS = _compile_category(URGENCY_KEYWORDS_IN_CONTEXT)
+# Every category pattern in one union: most texts match none of them
+_ANY_CATEGORY = compile_union(
+    DEADLINE_PATTERNS + IMMEDIACY_PATTERNS + TIME_PRESSURE_PATTERNS
+    + ACTION_REQUEST_PATTERNS + URGENCY_KEYWORDS_IN_CONTEXT,
+    re.IGNORECASE,
+)
+
+# Score slots, in scoring order
+(
+    _CAT_DEADLINE, _CAT_IMMEDIACY, _CAT_TIME_PRESSURE, _CAT_ACTION_REQUEST,
+    _CAT_KEYWORDS, _CAT_EXCLAMATION, _CAT_CAPS, _N_CATS,
+) = range(8)
+# Urgency cues an action request is amplified by (not emphasis alone)
+_NON_ACTION_CATS = (_CAT_DEADLINE, _CAT_IMMEDIACY, _CAT_TIME_PRESSURE, _CAT_KEYWORDS)
+
+# Phrase categories in scoring order:
+# (slot, compiled category, score per match, score cap, evidence label, evidence kept).
+# Evidence kept must reach the score cap (kept * per match >= cap), as
+# matching stops after that many matches.
+_CATEGORIES = (
+    (_CAT_DEADLINE, _DEADLINE, 0.15, 0.3, "Deadline language", 5),
+    (_CAT_IMMEDIACY, _IMMEDIACY, 0.15, 0.3, "Immediacy marker", 5),
+    (_CAT_TIME_PRESSURE, _TIME_PRESSURE, 0.12, 0.25, "Time pressure", 5),
+    # Action requests amplify urgency when combined with the above
+    (_CAT_ACTION_REQUEST, _ACTION_REQUEST, 0.1, 0.2, "Action request", 5),
+    (_CAT_KEYWORDS, _KEYWORDS, 0.08, 0.15, "Urgency keyword", 3),
+)
+
+# Literals at least one of which any urgency pattern needs (None: no gate).
+# Lowercased ASCII text without any of them gets the empty result directly.
+_TRIGGER = literal_gate(ALL_PATTERNS)
+
+# Evidence items returned per result
+_MAX_EVIDENCE = 10
+
+# Confidence buckets once there is evidence: below 0.2, below 0.5, 0.5 and up
+_CONFIDENCE_THRESHOLDS = (0.2, 0.5)
+_CONFIDENCE_LEVELS = (0.6, 0.75, 0.9)
+
+# The three emphasis patterns above in one scan. Group 1/2: urgency word
+# and its full run of "!" (case-insensitive); group 3: a CAPS urgency word,
+# matched in a lookahead so it does not consume text the other branches
+# need (e.g. the "NOW!" in "ACT NOW!"); group 4: a run of "!!" or more.
+# The leading class lets the engine skip positions no branch can start at.
+_EMPHASIS_RE = re.compile(
+    r'(?=[!\w])(?:'
+    r'\b(?:(?i:(urgent|now|hurry|quick|fast|immediately|asap|warning|alert|important)(!+))'
+    r'|(?=(URGENT|NOW|IMMEDIATELY|ASAP|WARNING|ALERT|CRITICAL|EMERGENCY|ACT NOW|HURRY|LIMITED TIME)\b))'
+    r'|(!{2,}))'
+)
+# CAPS words, to tell when an exclamation-branch match is also a CAPS match
+_CAPS_WORDS = frozenset(CAPS_URGENCY_PATTERN[3:-3].split("|"))
+
+
+def _find_matches(
+    text: str, category: Tuple[re.Pattern, Tuple[re.Pattern, ...]], limit: int
+) -> List[str]:
+    """
+    Find the first `limit` matches for a compiled category, in pattern order.
+
+    One scan of the union rules out the whole category on most texts. Only
+    on a hit are the patterns run one by one: matching per pattern keeps the
+    counts and evidence order exact, which a single union finditer would
+    not (matches of different patterns may overlap). Callers keep at most
+    `limit` matches as evidence and the category score is capped by then,
+    so matching stops there.
+    """
+    union, patterns = category
+    if union.search(text) is None:
+        return []
     matches = []
     for pattern in patterns:
-        found = re.findall(pattern, text, re.IGNORECASE)
-        matches.extend(found)
+        for match in pattern.finditer(text):
+            matches.append(match.group())
+            if len(matches) == limit:
+                return matches
     return matches
 
 
-def _count_exclamation_urgency(text: str) -> Tuple[int, List[str]]:
-    """Detect urgency emphasized with exclamation marks."""
-    evidence = []
-    # Look for repeated exclamation marks or urgency words followed by exclamation
-    urgent_exclaim_pattern = r'\b(?:urgent|now|hurry|quick|fast|immediately|asap|warning|alert|important)[!]{1,3}'
-    matches = re.findall(urgent_exclaim_pattern, text, re.IGNORECASE)
-    if matches:
-        evidence.extend(matches)
-    
+def _scan_emphasis(text: str, caps_limit: int) -> Tuple[int, List[str], List[str]]:
+    """
+    Detect urgency emphasized with exclamation marks or ALL CAPS, in one pass.
+
+    Returns (exclamation count, exclamation evidence, CAPS evidence for the
+    first `caps_limit` CAPS words), matching what URGENT_EXCLAIM_PATTERN,
+    MULTI_EXCLAIM_PATTERN and CAPS_URGENCY_PATTERN find when run separately.
+    """
+    exclaims = []
+    multi_count = 0
+    caps = []
+    caps_end = 0  # CAPS matches do not overlap each other, as with finditer
+    for match in _EMPHASIS_RE.finditer(text):
+        word, run, caps_word, multi = match.groups()
+        if word is not None:
+            exclaims.append(word + run[:3])
+            if len(run) >= 2:
+                multi_count += 1
+            caps_word = word if word in _CAPS_WORDS else None
+        elif multi is not None:
+            multi_count += 1
+        start = match.start()
+        if caps_word is not None and start >= caps_end and len(caps) < caps_limit:
+            caps.append(f"CAPS emphasis: {caps_word}")
+            caps_end = start + len(caps_word)
+
+    count = len(exclaims) + multi_count
     # Multiple exclamation marks in short text suggest urgency
-    multi_exclaim = re.findall(r'[!]{2,}', text)
-    if multi_exclaim:
-        evidence.append(f"Multiple exclamation marks ({len(multi_exclaim)} instances)")
-    
-    return len(matches) + len(multi_exclaim), evidence
+    if multi_count:
+        exclaims.append(f"Multiple exclamation marks ({multi_count} instances)")
+    return count, exclaims, caps
 
 
-def _has_caps_urgency(text: str) -> Tuple[bool, List[str]]:
-    """Detect urgency words in ALL CAPS."""
-    evidence = []
-    caps_urgency_pattern = r'\b(URGENT|NOW|IMMEDIATELY|ASAP|WARNING|ALERT|CRITICAL|EMERGENCY|ACT NOW|HURRY|LIMITED TIME)\b'
-    matches = re.findall(caps_urgency_pattern, text)
-    if matches:
-        evidence = [f"CAPS emphasis: {match}" for match in matches]
-    return bool(matches), evidence
+def _amplifiers(scores: List[float]) -> Tuple[bool, int]:
+    """(action request combined with another urgency cue, active category count)."""
+    combined = scores[_CAT_ACTION_REQUEST] > 0 and any(scores[i] > 0 for i in _NON_ACTION_CATS)
+    return combined, sum(1 for v in scores if v > 0)
 
 
-def analyze(text: str) -> SignalResult:
+def _score_floor(scores: List[float]) -> float:
+    """
+    Lower bound on the final score (before benign suppression) given the
+    categories found so far: further categories can only raise the base
+    score and switch multipliers on.
+    """
+    combined, active_categories = _amplifiers(scores)
+    multiplier = 1.25 if combined else 1.0
+    if active_categories >= 3:
+        multiplier *= 1.15
+    return min(sum(scores) * multiplier, 1.0)
+
+
+@memoize_analyzer
+def analyze(text: str, text_lower: Optional[str] = None) -> SignalResult:
     """
     Detect urgency-based social engineering signals in text.
     
     Args:
         text: The text to analyze
+        text_lower: text.lower(), if the caller has already computed it
         
     Returns:
         SignalResult with urgency detection results
@@ -143,66 +267,59 @@ def analyze(text: str) -> SignalResult:
             confidence=0.5,
             evidence=[]
         )
+
+    # Surrounding whitespace cannot change a match, so an unstripped
+    # text_lower is fine for the trigger and benign checks
+    if text_lower is None:
+        text_lower = text.lower()
+    if _TRIGGER is not None and text.isascii() and _TRIGGER.search(text_lower) is None:
+        return SignalResult(
+            signal_name="urgency",
+            score=0.0,
+            confidence=0.5,
+            evidence=[]
+        )
     
     evidence = []
-    category_scores = {}
-    
-    # Check deadline patterns
-    deadline_matches = _find_matches(text, DEADLINE_PATTERNS)
-    if deadline_matches:
-        evidence.extend([f"Deadline language: {m}" for m in deadline_matches[:5]])
-        category_scores['deadline'] = min(len(deadline_matches) * 0.15, 0.3)
-    
-    # Check immediacy patterns
-    immediacy_matches = _find_matches(text, IMMEDIACY_PATTERNS)
-    if immediacy_matches:
-        evidence.extend([f"Immediacy marker: {m}" for m in immediacy_matches[:5]])
-        category_scores['immediacy'] = min(len(immediacy_matches) * 0.15, 0.3)
-    
-    # Check time pressure patterns
-    pressure_matches = _find_matches(text, TIME_PRESSURE_PATTERNS)
-    if pressure_matches:
-        evidence.extend([f"Time pressure: {m}" for m in pressure_matches[:5]])
-        category_scores['time_pressure'] = min(len(pressure_matches) * 0.12, 0.25)
-    
-    # Check action request patterns (amplifies urgency when combined with above)
-    action_matches = _find_matches(text, ACTION_REQUEST_PATTERNS)
-    if action_matches:
-        evidence.extend([f"Action request: {m}" for m in action_matches[:5]])
-        category_scores['action_request'] = min(len(action_matches) * 0.1, 0.2)
-    
-    # Check contextual urgency keywords
-    keyword_matches = _find_matches(text, URGENCY_KEYWORDS_IN_CONTEXT)
-    if keyword_matches:
-        evidence.extend([f"Urgency keyword: {m}" for m in keyword_matches[:3]])
-        category_scores['keywords'] = min(len(keyword_matches) * 0.08, 0.15)
-    
-    # Check exclamation-based urgency
-    exclaim_count, exclaim_evidence = _count_exclamation_urgency(text)
-    if exclaim_evidence:
-        evidence.append(exclaim_evidence[0])  # Cap to single item
-        category_scores['exclamation'] = min(exclaim_count * 0.05, 0.1)
+    scores = [0.0] * _N_CATS
+
+    # One scan decides whether any phrase category can match at all
+    in_any_category = _ANY_CATEGORY.search(text) is not None
     
-    # Check CAPS-based urgency
-    has_caps, caps_evidence = _has_caps_urgency(text)
-    if has_caps:
-        evidence.extend(caps_evidence[:2])
-        category_scores['caps_emphasis'] = 0.1
+    # Once the score is pinned at 1.0 and the kept evidence is full, later
+    # scans can change neither, so they are skipped
+    saturated = False
+    for slot, category, per_match, cap, label, kept in _CATEGORIES:
+        matches = _find_matches(text, category, kept) if in_any_category else []
+        if matches:
+            evidence.extend([f"{label}: {m}" for m in matches])
+            scores[slot] = min(len(matches) * per_match, cap)
+            if len(evidence) >= _MAX_EVIDENCE and _score_floor(scores) >= 1.0:
+                saturated = True
+                break
+
+    if not saturated:
+        # Check exclamation- and CAPS-based urgency
+        exclaim_count, exclaim_evidence, caps_evidence = _scan_emphasis(text, 2)
+        if exclaim_evidence:
+            evidence.append(exclaim_evidence[0])  # Cap to single item
+            scores[_CAT_EXCLAMATION] = min(exclaim_count * 0.05, 0.1)
+
+        if caps_evidence:
+            evidence.extend(caps_evidence)
+            scores[_CAT_CAPS] = 0.1
     
     # Calculate base score from category scores
-    base_score = sum(category_scores.values())
+    base_score = sum(scores)
+    combined, active_categories = _amplifiers(scores)
     
     # Apply multiplier if action requests are combined with other urgency cues
     multiplier = 1.0
-    non_action_categories = {k: v for k, v in category_scores.items() 
-                           if k not in ('action_request', 'exclamation', 'caps_emphasis')}
-    
-    if category_scores.get('action_request', 0) > 0 and sum(non_action_categories.values()) > 0:
+    if combined:
         multiplier = 1.25
         evidence.append("Urgency combined with action request (amplified)")
     
     # Multiple urgency categories increase severity
-    active_categories = len([v for v in category_scores.values() if v > 0])
     if active_categories >= 3:
         multiplier *= 1.15
         evidence.append(f"Multiple urgency tactics detected ({active_categories} categories)")
@@ -210,8 +327,7 @@ def analyze(text: str) -> SignalResult:
     final_score = min(base_score * multiplier, 1.0)
 
     # Suppress score if benign context detected
-    text_lower = text.lower()
-    is_benign_context = any(re.search(p, text_lower) for p in BENIGN_URGENCY_PATTERNS)
+    is_benign_context = any(p.search(text_lower) for p in _BENIGN_RES)
     if is_benign_context:
         final_score = min(final_score, 0.1)  # Cap at low score for benign confirmations
         evidence.append("Benign context detected (confirmation/scheduling) - score suppressed")
@@ -219,16 +335,12 @@ def analyze(text: str) -> SignalResult:
     # Calculate confidence based on evidence strength
     if not evidence:
         confidence = 0.5
-    elif final_score < 0.2:
-        confidence = 0.6
-    elif final_score < 0.5:
-        confidence = 0.75
     else:
-        confidence = 0.9
+        confidence = score_confidence(final_score, _CONFIDENCE_THRESHOLDS, _CONFIDENCE_LEVELS)
     
     return SignalResult(
         signal_name="urgency",
         score=round(final_score, 3),
         confidence=confidence,
-        evidence=evidence[:10]  # Limit evidence to top 10 items
+        evidence=evidence[:_MAX_EVIDENCE]
     )
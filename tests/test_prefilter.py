@@ -0,0 +1,115 @@
+"""
+Soundness tests for the literal prefilters in security_logic.prefilter.
+
+A gate decides whether analyzers run at all, so every text a pattern
+matches must also hit the gate built from that pattern's list.
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nlp_pipeline.knowledge_base import SOCIAL_ENGINEERING_DATASET
+from security_logic import prefilter, rule_engine
+from security_logic.prefilter import literal_gate, required_literals
+from security_logic.signals import authority, fear_threat, impersonation, reward_lure, urgency
+from test_dataset import TEST_SAMPLES, VALIDATION_SAMPLES
+
+SIGNALS = (urgency, authority, impersonation, reward_lure, fear_threat)
+
+# Cases the samples cover thinly: ALL CAPS, "$" and "%"
+EDGE_CASES = [
+    "URGENT!!! ACT NOW",
+    "HURRY, LIMITED TIME OFFER ENDS BEFORE MIDNIGHT",
+    "EARN $5000/WEEK FROM HOME, NO EXPERIENCE NEEDED",
+    "Guaranteed 500% returns",
+    "GUARANTEED 300 % ROI",
+    "Pre-approved for $50,000",
+    "Made me $100,000!!",
+    "$9999 PER DAY",
+    "You'll receive 30%",
+    "FROM: PAYPAL SUPPORT",
+    "WELLS FARGO: Verify your account now",
+    "Call this number immediately to fix it",
+]
+
+
+def _corpus():
+    texts = [s["text"] for s in TEST_SAMPLES + VALIDATION_SAMPLES]
+    texts += [p["text"] for p in SOCIAL_ENGINEERING_DATASET]
+    # Word salad from the same vocabulary, for term combinations the
+    # samples lack
+    rng = random.Random(0)
+    words = " ".join(texts + EDGE_CASES).split()
+    texts += [" ".join(rng.choices(words, k=30)) for _ in range(300)]
+    texts += EDGE_CASES + [t.upper() for t in EDGE_CASES + texts[-300:]]
+    # Gates are only consulted for ASCII text
+    return [t for t in texts if t.isascii()]
+
+
+CORPUS = _corpus()
+
+
+def _matches_any(patterns, text):
+    return any(re.search(p, text, re.IGNORECASE) for p in patterns)
+
+
+@pytest.mark.parametrize("signal", SIGNALS, ids=lambda m: m.__name__.rsplit(".", 1)[-1])
+def test_required_literals_in_every_match(signal):
+    for pattern in signal.ALL_PATTERNS:
+        literals = required_literals(pattern)
+        if literals is None:
+            continue
+        lowered = [lit.lower() for lit in literals]
+        for text in CORPUS:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                found = match.group().lower()
+                assert any(lit in found for lit in lowered), (pattern, found)
+
+
+@pytest.mark.parametrize("signal", SIGNALS, ids=lambda m: m.__name__.rsplit(".", 1)[-1])
+def test_signal_gate_hit_by_every_match(signal):
+    gate = literal_gate(signal.ALL_PATTERNS)
+    if gate is None:
+        pytest.skip("no gate for this signal")
+    for text in CORPUS:
+        if _matches_any(signal.ALL_PATTERNS, text):
+            assert gate.search(text.lower()) is not None, text
+
+
+def test_gated_texts_get_empty_results():
+    gate = rule_engine._SIGNAL_GATE
+    assert gate is not None
+    skipped = [t for t in CORPUS if gate.search(t.lower()) is None]
+    assert skipped
+    for text in skipped:
+        for signal in SIGNALS:
+            result = signal.analyze.__wrapped__(text)
+            assert result.score == 0.0 and not result.evidence, (signal.__name__, text)
+
+
+def test_caps_and_symbol_literals():
+    assert required_literals(r"\$\d+") == {"$"}
+    assert required_literals(r"\d+\s*%") == {"%"}
+    caps_gate = literal_gate([urgency.CAPS_URGENCY_PATTERN])
+    assert caps_gate.search("LIMITED TIME".lower())
+    assert rule_engine._SIGNAL_GATE.search("$9999 per day")
+    assert rule_engine._SIGNAL_GATE.search("you'll receive 30%")
+
+
+def test_parse_failure_disables_gate():
+    with mock.patch.object(prefilter._sre_parse, "parse", side_effect=TypeError):
+        assert required_literals(r"\bfoo\b") is None
+        assert literal_gate([r"\bfoo\b"]) is None
+
+
+def test_failed_self_check_disables_gate():
+    with mock.patch.object(prefilter, "_PARSER_OK", False):
+        assert required_literals(r"\bfoo\b") is None
+        assert literal_gate(urgency.ALL_PATTERNS) is None